@@ -0,0 +1,160 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def approximate_count(queryset):
+    """
+    Estimated row count for ``queryset`` without scanning it.
+
+    Postgres answers from table statistics for unfiltered querysets and from
+    the planner's row estimate otherwise. Other databases count exactly.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+
+    if not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # Tables that were never analyzed report -1
+        if row and row[0] >= 0:
+            return row[0]
+        return queryset.count()
+
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    # Drivers differ on whether the plan comes back wrapped in a list
+    if isinstance(plan, list):
+        plan = plan[0]
+    return plan["Plan"]["Plan Rows"]
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pagination on ``(updated_at, id)``, newest first.
+
+    Each page is fetched with ``WHERE (updated_at, id) < cursor ... LIMIT n``,
+    so it costs the same however deep a client scrolls, provided the model
+    has an index on ``(-updated_at, -id)``. No total is computed unless the
+    client asks for ``?count=exact`` or the cheaper ``?count=approx``.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.count = self.get_count(queryset, request)
+        position, reverse = self.decode_cursor(request)
+
+        if position is not None:
+            updated_at, pk = position
+            if reverse:
+                after = Q(updated_at__gte=updated_at) & (
+                    Q(updated_at__gt=updated_at) | Q(pk__gt=pk)
+                )
+            else:
+                after = Q(updated_at__lte=updated_at) & (
+                    Q(updated_at__lt=updated_at) | Q(pk__lt=pk)
+                )
+            queryset = queryset.filter(after)
+
+        ordering = ("updated_at", "pk") if reverse else ("-updated_at", "-pk")
+        results = list(queryset.order_by(*ordering)[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        # Going back from a page always leaves a page ahead, and vice versa
+        if reverse:
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_count(self, queryset, request):
+        mode = request.query_params.get(self.count_query_param)
+        if mode == "exact":
+            return queryset.count()
+        if mode == "approx":
+            return approximate_count(queryset)
+        return None
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position = (datetime.fromisoformat(data["u"]), uuid.UUID(data["i"]))
+            return position, bool(data.get("r"))
+        except (TypeError, ValueError, KeyError, AttributeError):
+            raise NotFound("Invalid cursor")
+
+    def encode_cursor(self, instance, reverse):
+        data = {"u": instance.updated_at.isoformat(), "i": str(instance.pk)}
+        if reverse:
+            data["r"] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        response = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.count is not None:
+            response = {"count": self.count, **response}
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer"},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
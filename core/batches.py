@@ -0,0 +1,173 @@
+import asyncio
+import json
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from . import utils
+from .models import GenerationBatch, GenerationBatchItem, Partner, PressRelease
+
+
+def create_batch(jobs, force_regenerate=False):
+    """
+    Create a batch with one press release per job, queued for generation.
+
+    ``jobs`` are dicts with ``client``, ``country``, ``prompt`` and a list of
+    ``partners`` names. The items are generated by the generation worker.
+    """
+    with transaction.atomic():
+        batch = GenerationBatch.objects.create(force_regenerate=force_regenerate)
+        press_releases = PressRelease.objects.bulk_create(
+            [PressRelease(client=job["client"], country=job["country"]) for job in jobs]
+        )
+        Partner.objects.bulk_create(
+            [
+                Partner(press_release=press_release, name=name)
+                for press_release, job in zip(press_releases, jobs)
+                for name in job["partners"]
+            ]
+        )
+        GenerationBatchItem.objects.bulk_create(
+            [
+                GenerationBatchItem(
+                    batch=batch,
+                    press_release=press_release,
+                    prompt=job["prompt"],
+                    client=job["client"],
+                    country=job["country"],
+                    partners=job["partners"],
+                )
+                for press_release, job in zip(press_releases, jobs)
+            ]
+        )
+    return batch
+
+
+def claim_batch_items(limit):
+    """
+    Lock up to ``limit`` queued batch items for this worker.
+
+    Rows are claimed with SKIP LOCKED so concurrent workers never pick the same
+    item. Items left ``running`` by a lost worker are reclaimed once
+    GENERATION_LOCK_TIMEOUT has passed, or failed once they have used up
+    GENERATION_MAX_ATTEMPTS.
+    """
+    now = timezone.now()
+    stale = Q(status="running", locked_at__lt=now - timedelta(seconds=settings.GENERATION_LOCK_TIMEOUT))
+    with transaction.atomic():
+        abandoned = list(
+            GenerationBatchItem.objects.select_for_update(skip_locked=True)
+            .filter(stale, attempts__gte=settings.GENERATION_MAX_ATTEMPTS)
+            .values_list("id", flat=True)
+        )
+        if abandoned:
+            GenerationBatchItem.objects.filter(pk__in=abandoned).update(
+                status="failed", error="Generation worker stopped", locked_at=None, finished_at=now
+            )
+            for batch_id in set(
+                GenerationBatchItem.objects.filter(pk__in=abandoned).values_list("batch_id", flat=True)
+            ):
+                _complete_if_done(batch_id)
+
+        ids = list(
+            GenerationBatchItem.objects.select_for_update(skip_locked=True)
+            .filter(Q(status="queued") | stale)
+            .order_by("created_at")
+            .values_list("id", flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        GenerationBatchItem.objects.filter(pk__in=ids).update(
+            status="running", locked_at=now, attempts=F("attempts") + 1
+        )
+        GenerationBatch.objects.filter(items__in=ids, status="queued").update(
+            status="running", started_at=now
+        )
+    return ids
+
+
+async def run_batch_items(ids, concurrency=None):
+    """
+    Generate the claimed batch items, ``concurrency`` at a time.
+
+    Each press release is saved as soon as its generation finishes, so
+    pollers see results arrive one by one. A failed item records its error
+    without stopping the rest, and a batch completes with its last item.
+    """
+    concurrency = concurrency or settings.GENERATION_BATCH_CONCURRENCY
+    items = [
+        item
+        async for item in GenerationBatchItem.objects.filter(pk__in=ids)
+        .select_related("batch", "press_release")
+        .order_by("created_at")
+    ]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def generate(item):
+        async with semaphore:
+            await _generate_item(item, item.batch.force_regenerate)
+
+    await asyncio.gather(*(generate(item) for item in items))
+    for batch_id in {item.batch_id for item in items}:
+        await sync_to_async(_complete_if_done)(batch_id)
+    return len(items)
+
+
+def _complete_if_done(batch_id):
+    pending = GenerationBatchItem.objects.filter(
+        batch_id=batch_id, status__in=["queued", "running"]
+    ).exists()
+    if not pending:
+        GenerationBatch.objects.filter(pk=batch_id).exclude(status="completed").update(
+            status="completed", finished_at=timezone.now()
+        )
+
+
+async def _generate_item(item, force_regenerate):
+    item.status = "running"
+    await item.asave(update_fields=["status", "updated_at"])
+    try:
+        generated = await utils.aget_press_release(
+            prompt=item.prompt,
+            client=item.client,
+            partners=item.partners,
+            country=item.country,
+            template="",
+            force_regenerate=force_regenerate,
+        )
+        await sync_to_async(utils.save_generated_press_release)(
+            item.press_release, item.client, json.loads(generated)
+        )
+    except Exception as e:
+        item.status = "failed"
+        item.error = str(e)
+    else:
+        item.status = "completed"
+    item.finished_at = timezone.now()
+    item.locked_at = None
+    await item.asave(update_fields=["status", "error", "finished_at", "locked_at", "updated_at"])
+
+
+def batch_progress(batch):
+    counts = batch.items.aggregate(
+        total=Count("id"),
+        queued=Count("id", filter=Q(status="queued")),
+        running=Count("id", filter=Q(status="running")),
+        completed=Count("id", filter=Q(status="completed")),
+        failed=Count("id", filter=Q(status="failed")),
+    )
+    items = batch.items.order_by("created_at").values(
+        "press_release", "client", "country", "status", "error"
+    )
+    return {
+        "id": batch.pk,
+        "status": batch.status,
+        "started_at": batch.started_at,
+        "finished_at": batch.finished_at,
+        **counts,
+        "items": list(items),
+    }
@@ -0,0 +1,230 @@
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import DistributionDelivery, DistributionJob, Journalist, PressRelease
+from .pdf import artifact_hash, artifact_sources, press_release_pdf
+
+
+def resolve_recipients(emails):
+    """Return the journalists matching ``emails`` and the emails that matched nobody."""
+    journalists = list(
+        Journalist.objects.filter(email__in=set(emails)).only("id", "email")
+    )
+    known = {journalist.email for journalist in journalists}
+    unknown = sorted(set(emails) - known)
+    return journalists, unknown
+
+
+def share_press_release(press_release, journalists):
+    """Add ``journalists`` to ``shared_with`` in one insert, skipping existing pairs."""
+    through = PressRelease.shared_with.through
+    already_shared = set(
+        through.objects.filter(
+            pressrelease_id=press_release.pk,
+            journalist_id__in=[journalist.pk for journalist in journalists],
+        ).values_list("journalist_id", flat=True)
+    )
+    through.objects.bulk_create(
+        [
+            through(pressrelease_id=press_release.pk, journalist_id=journalist.pk)
+            for journalist in journalists
+            if journalist.pk not in already_shared
+        ],
+        ignore_conflicts=True,
+    )
+    press_release.save()
+
+
+def enqueue_distribution(press_release, journalists, base_url, subject=None,
+                         message=None, file_name=None):
+    """
+    Share a press release with ``journalists`` and queue one delivery each.
+
+    Returns the job; the emails are sent by the distribution worker.
+    """
+    with transaction.atomic():
+        share_press_release(press_release, journalists)
+        job = DistributionJob.objects.create(
+            press_release=press_release,
+            subject=subject or "New Press Release",
+            message=message or "",
+            file_name=file_name or "press_release",
+            base_url=base_url,
+            attachment_key=artifact_hash(press_release, base_url, *artifact_sources(press_release)),
+        )
+        DistributionDelivery.objects.bulk_create(
+            [
+                DistributionDelivery(job=job, email=journalist.email)
+                for journalist in journalists
+            ]
+        )
+        if not journalists:
+            # No worker will ever pick up an empty job
+            now = timezone.now()
+            job.status = "completed"
+            job.started_at = job.finished_at = now
+            job.save(update_fields=["status", "started_at", "finished_at", "updated_at"])
+    return job
+
+
+def claim_deliveries(chunk_size):
+    """
+    Lock up to ``chunk_size`` queued deliveries for this worker.
+
+    Rows are claimed with SKIP LOCKED so concurrent workers never pick the same
+    delivery. Failed deliveries wait until their ``next_attempt_at``, and
+    deliveries left in ``sending`` by a crashed worker are reclaimed once
+    DISTRIBUTION_LOCK_TIMEOUT has passed, or failed once they have used up
+    DISTRIBUTION_MAX_ATTEMPTS.
+    """
+    now = timezone.now()
+    stale = Q(
+        status="sending",
+        locked_at__lt=now - timedelta(seconds=settings.DISTRIBUTION_LOCK_TIMEOUT),
+    )
+    with transaction.atomic():
+        abandoned = list(
+            DistributionDelivery.objects.select_for_update(skip_locked=True)
+            .filter(stale, attempts__gte=settings.DISTRIBUTION_MAX_ATTEMPTS)
+            .values_list("id", "job_id")
+        )
+        if abandoned:
+            DistributionDelivery.objects.filter(pk__in=[pk for pk, _ in abandoned]).update(
+                status="failed", error="Distribution worker stopped", locked_at=None
+            )
+            for job in DistributionJob.objects.filter(pk__in={job_id for _, job_id in abandoned}):
+                _complete_if_done(job)
+
+        ids = list(
+            DistributionDelivery.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status="queued", next_attempt_at__isnull=True)
+                | Q(status="queued", next_attempt_at__lte=now)
+                | stale
+            )
+            .order_by("created_at")
+            .values_list("id", flat=True)[:chunk_size]
+        )
+        if not ids:
+            return []
+        DistributionDelivery.objects.filter(pk__in=ids).update(
+            status="sending", locked_at=now, attempts=F("attempts") + 1
+        )
+        DistributionJob.objects.filter(
+            deliveries__in=ids, status="queued"
+        ).update(status="running", started_at=now)
+    return ids
+
+
+def build_email(job, recipient, pdf):
+    html_string = render_to_string(
+        "pdf.html",
+        {
+            "sender_name": "Wezawire",
+            "recipient": recipient,
+            "sender_role": "Admin",
+        },
+    )
+
+    email_message = EmailMultiAlternatives(
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[recipient],
+        subject=job.subject,
+        body=job.message,
+    )
+    email_message.attach_alternative(html_string, "text/html")
+    email_message.attach(f"{job.file_name}.pdf", pdf, "application/pdf")
+    email_message.template_id = "d-c00dfda29d33494ca0df0c0cab5f1aaa "
+    email_message.dynamic_template_data = (
+        {"sender_name": "Nick", "recipient": "Nelson", "sender_role": "Admin"},
+    )
+    return email_message
+
+
+def process_deliveries(ids, mailer):
+    """Send the claimed deliveries over ``mailer``, grouped by job."""
+    deliveries = (
+        DistributionDelivery.objects.filter(pk__in=ids)
+        .select_related("job__press_release")
+        .order_by("job_id", "created_at")
+    )
+    for job, group in groupby(deliveries, key=lambda delivery: delivery.job):
+        pr = job.press_release
+        try:
+            pdf = press_release_pdf(pr, job.attachment_key, job.base_url)
+        except Exception as e:
+            # Fails the job's deliveries, not the worker
+            for delivery in group:
+                _retry_or_fail(delivery, f"Rendering the attachment failed: {e}")
+            _complete_if_done(job)
+            continue
+
+        for delivery in group:
+            try:
+                mailer.send(build_email(job, delivery.email, pdf))
+            except Exception as e:
+                _retry_or_fail(delivery, str(e))
+            else:
+                _finish(delivery, "sent")
+
+        _complete_if_done(job)
+    return len(ids)
+
+
+def _retry_or_fail(delivery, error):
+    if delivery.attempts < settings.DISTRIBUTION_MAX_ATTEMPTS:
+        _finish(delivery, "queued", error, retry_at=_next_attempt_at(delivery.attempts))
+    else:
+        _finish(delivery, "failed", error)
+
+
+def _next_attempt_at(attempts):
+    """Exponential backoff from DISTRIBUTION_RETRY_DELAY, doubling per attempt made."""
+    delay = min(
+        settings.DISTRIBUTION_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.DISTRIBUTION_RETRY_MAX_DELAY,
+    )
+    return timezone.now() + timedelta(seconds=delay)
+
+
+def _finish(delivery, status, error=None, retry_at=None):
+    delivery.status = status
+    delivery.error = error
+    delivery.locked_at = None
+    delivery.next_attempt_at = retry_at
+    delivery.save(update_fields=["status", "error", "locked_at", "next_attempt_at", "updated_at"])
+
+
+def _complete_if_done(job):
+    pending = job.deliveries.filter(status__in=["queued", "sending"]).exists()
+    if not pending:
+        DistributionJob.objects.filter(pk=job.pk).exclude(status="completed").update(
+            status="completed", finished_at=timezone.now()
+        )
+
+
+def job_progress(job):
+    counts = job.deliveries.aggregate(
+        total=Count("id"),
+        queued=Count("id", filter=Q(status__in=["queued", "sending"])),
+        sent=Count("id", filter=Q(status="sent")),
+        failed=Count("id", filter=Q(status="failed")),
+        retried=Count(
+            "id", filter=Q(attempts__gt=1) | Q(status="queued", attempts__gt=0)
+        ),
+    )
+    return {
+        "id": job.id,
+        "press_release": job.press_release_id,
+        "status": job.status,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        **counts,
+    }
@@ -0,0 +1,93 @@
+import csv
+import json
+import tempfile
+import uuid
+from datetime import datetime
+
+import openpyxl
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Journalist
+
+EXPORT_CONTENT_TYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+def journalist_export_fields():
+    return [
+        field.name
+        for field in Journalist._meta.fields
+        if field.name not in ("id", "search_vector")
+    ]
+
+
+def journalist_rows(fields, country=None, media_house=None, chunk_size=None):
+    """Yield journalist rows as tuples, streaming from the database in chunks."""
+    queryset = Journalist.objects.order_by("created_at")
+    if country:
+        queryset = queryset.filter(country__iexact=country)
+    if media_house:
+        queryset = queryset.filter(media_house__iexact=media_house)
+    return queryset.values_list(*fields).iterator(
+        chunk_size=chunk_size or settings.EXPORT_CHUNK_SIZE
+    )
+
+
+def iter_export(file_format, country=None, media_house=None, chunk_size=None):
+    """
+    Yield an export of journalists as byte chunks.
+
+    Memory use stays flat regardless of table size: rows are read with a
+    server-side cursor and written out as they arrive. Excel files are built
+    by openpyxl in write-only mode on a temporary file, then streamed.
+    """
+    fields = journalist_export_fields()
+    rows = journalist_rows(fields, country, media_house, chunk_size)
+    writers = {"xlsx": _iter_xlsx, "csv": _iter_csv, "jsonl": _iter_jsonl}
+    return writers[file_format](fields, rows)
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def _iter_csv(fields, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields).encode()
+    for row in rows:
+        yield writer.writerow(row).encode()
+
+
+def _iter_jsonl(fields, rows):
+    for row in rows:
+        yield (json.dumps(dict(zip(fields, row)), cls=DjangoJSONEncoder) + "\n").encode()
+
+
+def _xlsx_value(value):
+    # Excel cannot store timezones, and openpyxl does not know UUIDs
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _iter_xlsx(fields, rows):
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Journalists")
+    ws.append(fields)
+    for row in rows:
+        ws.append([_xlsx_value(value) for value in row])
+
+    with tempfile.TemporaryFile() as tmp:
+        wb.save(tmp)
+        tmp.seek(0)
+        while chunk := tmp.read(FILE_CHUNK_SIZE):
+            yield chunk
@@ -0,0 +1,82 @@
+import hashlib
+
+import pdfplumber
+import pypdfium2
+from django.conf import settings
+from django.core.cache import cache
+
+
+def file_sha256(uploaded_file):
+    """Hash an uploaded file chunk by chunk, leaving it rewound for reading."""
+    digest = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
+
+
+def _pdf_source(uploaded_file):
+    # Large uploads are already spooled to disk; let the parser read them there
+    if hasattr(uploaded_file, "temporary_file_path"):
+        return uploaded_file.temporary_file_path()
+    return uploaded_file
+
+
+def iter_page_text(pdf_file, layout=False, max_pages=None):
+    """
+    Yield the text of each page in turn, up to ``max_pages``.
+
+    The pdfium text layer is read directly by default, which is much faster
+    than pdfplumber's layout analysis; pass ``layout=True`` when line and
+    column structure matters. Pages are released as soon as they are read.
+    """
+    max_pages = max_pages or settings.TEMPLATE_MAX_PAGES
+    if layout:
+        with pdfplumber.open(pdf_file) as pdf:
+            for page in pdf.pages[:max_pages]:
+                yield page.extract_text() or ""
+                page.close()
+        return
+
+    pdf = pypdfium2.PdfDocument(pdf_file)
+    try:
+        for index in range(min(len(pdf), max_pages)):
+            page = pdf[index]
+            text_page = page.get_textpage()
+            try:
+                # pdfium ends lines with \r\n
+                yield text_page.get_text_bounded().replace("\r\n", "\n")
+            finally:
+                text_page.close()
+                page.close()
+    finally:
+        pdf.close()
+
+
+def extract_text_from_pdf(uploaded_file, layout=False, max_pages=None, max_chars=None):
+    """
+    Extract text from an uploaded template PDF, capped in pages and characters.
+
+    Results are cached by the file's SHA-256, so uploading the same template
+    again skips parsing entirely.
+    """
+    max_pages = max_pages or settings.TEMPLATE_MAX_PAGES
+    max_chars = max_chars or settings.TEMPLATE_MAX_CHARS
+    key = f"pdf-text:{file_sha256(uploaded_file)}:{int(layout)}:{max_pages}:{max_chars}"
+    text = cache.get(key)
+    if text is not None:
+        return text
+
+    text_data = []
+    length = 0
+    for text in iter_page_text(_pdf_source(uploaded_file), layout, max_pages):
+        if not text.strip():
+            continue
+        text_data.append(text[:max_chars - length])
+        length += len(text) + 1
+        if length >= max_chars:
+            break
+
+    text = "\n".join(text_data)[:max_chars]
+    cache.set(key, text, settings.TEMPLATE_TEXT_CACHE_TTL)
+    return text
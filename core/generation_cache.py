@@ -0,0 +1,91 @@
+import hashlib
+import json
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import GenerationCache
+
+
+def prompt_fingerprint(messages, schema, model):
+    """
+    Hash a completion request so equivalent prompts share a cache entry.
+
+    Whitespace inside message content is collapsed, so re-indenting or
+    re-wrapping the same prompt still hits the cache.
+    """
+    normalized = [
+        {"role": m["role"], "content": re.sub(r"\s+", " ", m["content"]).strip()}
+        for m in messages
+    ]
+    payload = json.dumps(
+        {"model": model, "messages": normalized, "schema": schema}, sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_cached_generation(fingerprint):
+    """Return the cached completion for ``fingerprint``, or None on a miss."""
+    now = timezone.now()
+    entry = (
+        GenerationCache.objects.filter(fingerprint=fingerprint, expires_at__gt=now)
+        .only("response")
+        .first()
+    )
+    if entry is None:
+        return None
+    if not is_complete_generation(entry.response, "stop"):
+        # Stored before incomplete completions were rejected
+        GenerationCache.objects.filter(pk=entry.pk).delete()
+        return None
+    GenerationCache.objects.filter(pk=entry.pk).update(
+        hits=F("hits") + 1, last_used_at=now
+    )
+    return entry.response
+
+
+def is_complete_generation(response, finish_reason):
+    """
+    Whether a completion is fit to replay: it ran to a natural stop and is JSON.
+
+    Truncated (``finish_reason="length"``) and refused completions are not.
+    """
+    if finish_reason != "stop" or not response:
+        return False
+    try:
+        json.loads(response)
+    except ValueError:
+        return False
+    return True
+
+
+def store_generation(fingerprint, model, response, finish_reason="stop"):
+    """Cache ``response`` for ``fingerprint``, unless it is incomplete."""
+    if not is_complete_generation(response, finish_reason):
+        return
+    now = timezone.now()
+    GenerationCache.objects.update_or_create(
+        fingerprint=fingerprint,
+        defaults={
+            "model": model,
+            "response": response,
+            "last_used_at": now,
+            "expires_at": now + timedelta(seconds=settings.GENERATION_CACHE_TTL),
+        },
+    )
+    evict_generations()
+
+
+def evict_generations():
+    """Drop expired entries, then the least recently used beyond the size cap."""
+    GenerationCache.objects.filter(expires_at__lte=timezone.now()).delete()
+    stale = list(
+        GenerationCache.objects.order_by("-last_used_at").values_list(
+            "pk", flat=True
+        )[settings.GENERATION_CACHE_MAX_ENTRIES:]
+    )
+    if stale:
+        GenerationCache.objects.filter(pk__in=stale).delete()
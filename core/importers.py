@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.db import transaction
+
+from .models import Journalist
+from .search import refresh_search_vectors
+
+JOURNALIST_FIELDS = ["email", "name", "phone", "country", "title", "media_house"]
+
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+
+
+def journalist_max_lengths():
+    """Column length limits, so over-long values fail one row instead of a whole batch."""
+    return {
+        field: Journalist._meta.get_field(field).max_length
+        for field in JOURNALIST_FIELDS
+        if Journalist._meta.get_field(field).max_length
+    }
+
+
+def upsert_journalists(records, batch_size=None):
+    """
+    Insert or update journalists by email using chunked bulk upserts.
+
+    ``records`` are dicts keyed by JOURNALIST_FIELDS with unique emails.
+    Existing emails are looked up in one query up front, and each chunk is
+    written with a single INSERT ... ON CONFLICT (email) DO UPDATE in its own
+    transaction. Returns ``(created, updated, failures)`` where failures
+    lists ``(record, reason)`` for rows in chunks the database rejected.
+    """
+    batch_size = batch_size or settings.JOURNALIST_UPSERT_BATCH_SIZE
+    existing = set(
+        Journalist.objects.filter(
+            email__in=[record["email"] for record in records]
+        ).values_list("email", flat=True)
+    )
+    update_fields = [field for field in JOURNALIST_FIELDS if field != "email"]
+
+    created = updated = 0
+    failures = []
+    for start in range(0, len(records), batch_size):
+        batch = records[start:start + batch_size]
+        try:
+            with transaction.atomic():
+                Journalist.objects.bulk_create(
+                    [Journalist(**record) for record in batch],
+                    update_conflicts=True,
+                    unique_fields=["email"],
+                    update_fields=update_fields + ["updated_at"],
+                )
+                refresh_search_vectors(
+                    Journalist.objects.filter(
+                        email__in=[record["email"] for record in batch]
+                    )
+                )
+        except Exception as e:
+            failures.extend((record, str(e)) for record in batch)
+            continue
+
+        new = sum(1 for record in batch if record["email"] not in existing)
+        created += new
+        updated += len(batch) - new
+
+    return created, updated, failures
@@ -1,39 +1,53 @@
 import pandas as pd
-from django.db import transaction
-from django.db.models import Q
+from django.http import StreamingHttpResponse
 from rest_framework import status
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from common.pagination import KeysetPagination
+
+from .exports import EXPORT_CONTENT_TYPES, iter_export
+from .importers import (
+    EMAIL_PATTERN,
+    JOURNALIST_FIELDS,
+    journalist_max_lengths,
+    upsert_journalists,
+)
 from .models import Journalist
+from .search import search_journalists
 from .serializers import JournalistSerializer
 
 
+def _text_column(series):
+    """Strip a spreadsheet column to text, keeping whole numbers such as phones intact."""
+    if pd.api.types.is_float_dtype(series) and (series.dropna() % 1 == 0).all():
+        series = series.astype("Int64")
+    series = series.astype("string").str.strip()
+    return series.mask(series == "")
+
+
 class JournalistListView(APIView):
     """
     API endpoint to list journalists with pagination and search functionality.
     """
 
-    pagination_class = PageNumberPagination
+    pagination_class = KeysetPagination
 
     def get(self, request):
         queryset = Journalist.objects.all()
+        paginator = self.pagination_class()
 
-        # Searching functionality (email, name, country, title, media_house)
+        # Ranked prefix search over email, name, country, title and media_house.
+        # Ranked results keep their order, so they are paged by number instead.
         search_query = request.query_params.get("search", None)
         if search_query:
-            queryset = queryset.filter(
-                Q(email__icontains=search_query)
-                | Q(name__icontains=search_query)
-                | Q(country__icontains=search_query)
-                | Q(title__icontains=search_query)
-                | Q(media_house__icontains=search_query)
-            )
+            queryset = search_journalists(queryset, search_query)
+            paginator = PageNumberPagination()
 
         # Apply pagination
-        paginator = self.pagination_class()
         paginated_queryset = paginator.paginate_queryset(queryset, request)
 
         # Serialize data
@@ -62,6 +76,7 @@ class JournalistBulkUploadView(APIView):
         try:
             # Read Excel file
             df = pd.read_excel(excel_file)
+            df.columns = [str(column).strip() for column in df.columns]
 
             # Basic validation - ensure required fields exist
             if "email" not in df.columns:
@@ -70,49 +85,42 @@ class JournalistBulkUploadView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # Clean data - replace NaN with None
-            df = df.where(pd.notnull(df), None)
-
-            # Track results
-            created_count = 0
-            updated_count = 0
-            failed_entries = []
-
-            # Use transaction to ensure database consistency
-            with transaction.atomic():
-                for _, row in df.iterrows():
-                    try:
-                        # Convert row to dict
-                        journalist_data = {
-                            "email": row.get("email"),
-                            "name": row.get("name"),
-                            "phone": row.get("phone"),
-                            "country": row.get("country"),
-                            "title": row.get("title"),
-                            "media_house": row.get("media_house"),
-                        }
-
-                        # Check if email is valid
-                        if not journalist_data["email"] or pd.isna(
-                            journalist_data["email"]
-                        ):
-                            failed_entries.append(
-                                {"row": dict(row), "reason": "Missing or invalid email"}
-                            )
-                            continue
-
-                        # Try to update existing record, create if it doesn't exist
-                        journalist, created = Journalist.objects.update_or_create(
-                            email=journalist_data["email"], defaults=journalist_data
-                        )
-
-                        if created:
-                            created_count += 1
-                        else:
-                            updated_count += 1
-
-                    except Exception as e:
-                        failed_entries.append({"row": dict(row), "reason": str(e)})
+            # Original rows, with NaN replaced by None, for error reporting
+            raw = df.astype(object).where(pd.notnull(df), None)
+
+            # Normalize every column at once instead of row by row
+            frame = pd.DataFrame(
+                {
+                    field: _text_column(df[field])
+                    if field in df.columns
+                    else pd.Series(pd.NA, index=df.index, dtype="string")
+                    for field in JOURNALIST_FIELDS
+                }
+            )
+
+            # Validate vectorized; each failed row keeps its first reason
+            reasons = pd.Series(None, index=df.index, dtype=object)
+            reasons[frame["email"].isna()] = "Missing or invalid email"
+            bad_email = ~frame["email"].str.match(EMAIL_PATTERN).fillna(True).astype(bool)
+            reasons[bad_email & reasons.isna()] = "Missing or invalid email"
+            for field, max_length in journalist_max_lengths().items():
+                too_long = (frame[field].str.len() > max_length).fillna(False).astype(bool)
+                reasons[too_long & reasons.isna()] = (
+                    f"{field} is longer than {max_length} characters"
+                )
+
+            # Later rows win when an email repeats, as with row-by-row updates
+            valid = frame[reasons.isna()]
+            unique = valid.drop_duplicates("email", keep="last")
+            records = unique.astype(object).where(unique.notna(), None).to_dict("records")
+
+            created_count, updated_count, failures = upsert_journalists(records)
+            updated_count += len(valid) - len(unique)
+
+            failed_entries = [
+                {"row": raw.loc[index].to_dict(), "reason": reasons[index]}
+                for index in reasons.dropna().index
+            ] + [{"row": record, "reason": reason} for record, reason in failures]
 
             return Response(
                 {
@@ -132,3 +140,32 @@ class JournalistBulkUploadView(APIView):
                 {"error": f"Failed to process Excel file: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+class JournalistExportView(APIView):
+    """
+    Stream all journalists as xlsx, csv or jsonl.
+
+    Query params: ``file_format`` (default xlsx), ``country`` and ``media_house``.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        file_format = request.query_params.get("file_format", "xlsx")
+        if file_format not in EXPORT_CONTENT_TYPES:
+            return Response(
+                {"error": f"file_format must be one of {', '.join(EXPORT_CONTENT_TYPES)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        response = StreamingHttpResponse(
+            iter_export(
+                file_format,
+                country=request.query_params.get("country"),
+                media_house=request.query_params.get("media_house"),
+            ),
+            content_type=EXPORT_CONTENT_TYPES[file_format],
+        )
+        response["Content-Disposition"] = f'attachment; filename="journalists.{file_format}"'
+        return response
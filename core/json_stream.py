@@ -0,0 +1,88 @@
+import json
+import re
+
+# A trailing backslash or \u escape that the next chunk has yet to complete.
+_INCOMPLETE_ESCAPE = re.compile(r"(?<!\\)((?:\\\\)*)(\\|\\u[0-9a-fA-F]{0,3})$")
+# A UTF-16 high surrogate whose low half has not arrived yet.
+_TRAILING_HIGH_SURROGATE = re.compile(r"(?<!\\)((?:\\\\)*)\\u[dD][89abAB][0-9a-fA-F]{2}$")
+
+
+class JsonFieldStream:
+    """
+    Incrementally parse a streamed JSON object.
+
+    ``feed`` accepts raw text as it arrives and returns ``(field, delta)``
+    pairs for the top-level string fields, so a client can render each field
+    while the rest of the document is still being generated. Nested values
+    are only available once the whole document has arrived via ``document``.
+    """
+
+    def __init__(self):
+        self.text = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._raw = []
+        self._key = None
+        self._field = None
+        self._pending = ""
+
+    def feed(self, chunk):
+        self.text.append(chunk)
+        events = []
+        for char in chunk:
+            if self._in_string:
+                self._read_string_char(char, events)
+            elif char == '"':
+                self._in_string = True
+                self._raw = []
+                if self._depth == 1 and not self._expect_key and self._key is not None:
+                    self._field = self._key
+            elif char in "{[":
+                self._depth += 1
+                self._expect_key = self._depth == 1 and char == "{"
+            elif char in "}]":
+                self._depth -= 1
+            elif self._depth == 1 and char == ",":
+                self._expect_key = True
+                self._key = None
+            elif self._depth == 1 and char == ":":
+                self._expect_key = False
+
+        if self._field is not None:
+            self._flush(events, final=False)
+        return events
+
+    def document(self):
+        return json.loads("".join(self.text))
+
+    def _read_string_char(self, char, events):
+        if self._escape:
+            self._escape = False
+        elif char == "\\":
+            self._escape = True
+        elif char == '"':
+            self._in_string = False
+            if self._field is not None:
+                self._flush(events, final=True)
+                self._field = None
+            elif self._depth == 1 and self._expect_key:
+                self._key = json.loads('"' + "".join(self._raw) + '"')
+            return
+        self._raw.append(char)
+
+    def _flush(self, events, final):
+        raw = self._pending + "".join(self._raw)
+        self._raw = []
+        if final:
+            safe, self._pending = raw, ""
+        else:
+            cut = len(raw)
+            for pattern in (_INCOMPLETE_ESCAPE, _TRAILING_HIGH_SURROGATE):
+                match = pattern.search(raw, 0, cut)
+                if match:
+                    cut = match.start() + len(match.group(1))
+            safe, self._pending = raw[:cut], raw[cut:]
+        if safe:
+            events.append((self._field, json.loads('"' + safe + '"')))
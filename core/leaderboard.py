@@ -0,0 +1,83 @@
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import LeaderboardEntry, PointTransaction
+
+WINDOWS = ("all", "month")
+
+
+def period_for_window(window, month=None):
+    """Map ``window`` (all or month) to a LeaderboardEntry period key."""
+    if window == "all":
+        return LeaderboardEntry.ALL_TIME
+    return month or LeaderboardEntry.period_for(timezone.now())
+
+
+def leaderboard_page(period, offset=0, limit=10):
+    """
+    Return ranked entries for ``period`` and whether more follow.
+
+    Ranks use competition ranking: tied journalists share a rank and the next
+    rank skips ahead (1, 2, 2, 4). Reads come from the (period, -points) index,
+    so the cost depends on the page size, not the number of journalists.
+    """
+    entries = list(
+        LeaderboardEntry.objects.filter(period=period)
+        .select_related("journalist")
+        .only("points", "journalist__id", "journalist__name", "journalist__email")
+        .order_by("-points", "journalist_id")[offset:offset + limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    rows = []
+    for index, entry in enumerate(entries):
+        if index and entry.points == entries[index - 1].points:
+            rank = rows[-1]["rank"]
+        elif index:
+            rank = offset + index + 1
+        else:
+            # The first row may tie with rows on earlier pages
+            rank = LeaderboardEntry.objects.filter(
+                period=period, points__gt=entry.points
+            ).count() + 1
+        rows.append({
+            "rank": rank,
+            "journalist": entry.journalist_id,
+            "name": entry.journalist.name if entry.journalist.name else entry.journalist.email,
+            "email": entry.journalist.email,
+            "points": entry.points,
+        })
+    return rows, has_more
+
+
+def rebuild_leaderboard(batch_size=1000):
+    """Recreate every leaderboard entry from the point transaction ledger."""
+    all_time = PointTransaction.objects.values("journalist_id").annotate(
+        total=Sum("points")
+    ).order_by()
+    monthly = PointTransaction.objects.annotate(month=TruncMonth("created_at")).values(
+        "journalist_id", "month"
+    ).annotate(total=Sum("points")).order_by()
+
+    entries = [
+        LeaderboardEntry(
+            journalist_id=row["journalist_id"],
+            period=LeaderboardEntry.ALL_TIME,
+            points=row["total"],
+        )
+        for row in all_time
+    ] + [
+        LeaderboardEntry(
+            journalist_id=row["journalist_id"],
+            period=row["month"].strftime("%Y-%m"),
+            points=row["total"],
+        )
+        for row in monthly
+    ]
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+        LeaderboardEntry.objects.bulk_create(entries, batch_size=batch_size)
+    return len(entries)
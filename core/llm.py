@@ -0,0 +1,287 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+
+import httpx
+import openai
+from django.conf import settings
+from openai import AsyncOpenAI
+
+from .prompts import count_tokens
+
+_clients = weakref.WeakKeyDictionary()
+
+
+class LLMError(Exception):
+    pass
+
+
+class LLMUnavailable(LLMError):
+    """Upstream is failing or the circuit breaker is open; try again later."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMRateLimited(LLMUnavailable):
+    pass
+
+
+def get_async_client():
+    """
+    Return the AsyncOpenAI client for the running event loop.
+
+    Every request handled by the loop shares the client and its pooled HTTP
+    connections. Under ASGI there is one loop per worker process, so one
+    client serves all concurrent generations. Retries are left to
+    chat_completion, so the SDK's own are disabled.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=settings.OPENAI_KEY,
+            base_url=settings.OPENAI_BASE_URL or None,
+            max_retries=0,
+            timeout=httpx.Timeout(settings.OPENAI_TIMEOUT, connect=settings.OPENAI_CONNECT_TIMEOUT),
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+            ),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_async_client():
+    """Close the running loop's client, for loops that end before the process does."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+class TokenBucket:
+    """
+    Process-wide limiter refilling ``per_minute`` units a minute.
+
+    State sits behind a thread lock and callers sleep outside it, so the
+    bucket is shared by every event loop and thread in the process.
+    """
+
+    def __init__(self, per_minute):
+        self.per_minute = per_minute
+        self.capacity = per_minute
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, amount):
+        """Take ``amount`` now, going into debt if needed; return the wait for the debt."""
+        with self._lock:
+            now = time.monotonic()
+            rate = self.per_minute / 60
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * rate)
+            self.updated = now
+            self.tokens -= min(amount, self.capacity)
+            return max(0.0, -self.tokens / rate)
+
+    async def acquire(self, amount=1, deadline=None):
+        if not self.per_minute:
+            return
+        wait = self._reserve(amount)
+        if deadline is not None and time.monotonic() + wait > deadline:
+            with self._lock:
+                self.tokens += min(amount, self.capacity)
+            raise LLMRateLimited("Local rate limit would exceed the call deadline", retry_after=wait)
+        if wait:
+            await asyncio.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Fail fast after ``threshold`` consecutive upstream failures.
+
+    Once open, calls are refused for ``cooldown`` seconds, then a single trial
+    call is let through: success closes the breaker, failure re-opens it.
+    """
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.cooldown:
+            return "open"
+        return "half-open"
+
+    def before_call(self):
+        with self._lock:
+            state = self.state
+            if state == "open" or (state == "half-open" and self._trial_running):
+                retry_after = self.cooldown - (time.monotonic() - self.opened_at)
+                raise LLMUnavailable("OpenAI is unavailable, not calling it", retry_after=max(retry_after, 1))
+            if state == "half-open":
+                self._trial_running = True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def abandon(self):
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+
+
+_gateway_lock = threading.Lock()
+_request_bucket = None
+_token_bucket = None
+_breaker = None
+
+
+def _gateway():
+    """The process-wide limiters and breaker, built from settings on first use."""
+    global _request_bucket, _token_bucket, _breaker
+    with _gateway_lock:
+        if _breaker is None:
+            _request_bucket = TokenBucket(settings.OPENAI_REQUESTS_PER_MINUTE)
+            _token_bucket = TokenBucket(settings.OPENAI_TOKENS_PER_MINUTE)
+            _breaker = CircuitBreaker(
+                settings.OPENAI_BREAKER_THRESHOLD, settings.OPENAI_BREAKER_COOLDOWN
+            )
+        return _request_bucket, _token_bucket, _breaker
+
+
+def reset_gateway():
+    """Forget limiter and breaker state, e.g. after changing settings in tests."""
+    global _request_bucket, _token_bucket, _breaker
+    with _gateway_lock:
+        _request_bucket = _token_bucket = _breaker = None
+
+
+def _retry_after(error):
+    """Seconds the server asked us to wait, from Retry-After(-ms) headers."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+
+def _backoff(attempt):
+    # Full jitter keeps concurrent callers from retrying in lockstep
+    return random.uniform(0, min(settings.OPENAI_BACKOFF_MAX, settings.OPENAI_BACKOFF_BASE * 2 ** attempt))
+
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+async def chat_completion(timeout=None, **kwargs):
+    """
+    Call ``chat.completions.create`` through the gateway.
+
+    The call, including retries, must finish within ``timeout`` seconds
+    (OPENAI_TIMEOUT by default). Requests and estimated prompt tokens are
+    metered by token buckets sized to the account limits. Rate limits,
+    timeouts, connection errors and 5xx responses are retried with jittered
+    exponential backoff, waiting at least as long as Retry-After asks. Raises
+    LLMRateLimited or LLMUnavailable when upstream cannot serve the call in
+    time, and LLMUnavailable straight away while the circuit breaker is open.
+    Streaming calls return once the stream is open; iterate them with
+    stream_chunks or stream_text.
+    """
+    request_bucket, token_bucket, breaker = _gateway()
+    timeout = timeout or settings.OPENAI_TIMEOUT
+    deadline = time.monotonic() + timeout
+    tokens = sum(count_tokens(str(m.get("content", ""))) for m in kwargs.get("messages", []))
+
+    attempt = 0
+    while True:
+        breaker.before_call()
+        try:
+            await request_bucket.acquire(1, deadline)
+            await token_bucket.acquire(tokens, deadline)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise LLMUnavailable(f"OpenAI call exceeded its {timeout}s deadline")
+        except BaseException:
+            # Never reached upstream, so a half-open trial must be given back
+            breaker.abandon()
+            raise
+
+        try:
+            result = await asyncio.wait_for(
+                get_async_client().with_options(timeout=remaining).chat.completions.create(**kwargs),
+                remaining,
+            )
+        except (asyncio.TimeoutError, *RETRYABLE_ERRORS) as e:
+            if isinstance(e, openai.RateLimitError):
+                # A healthy but busy upstream: back off without tripping the breaker
+                breaker.abandon()
+            else:
+                breaker.record_failure()
+            retry_after = _retry_after(e)
+            delay = max(retry_after or 0, _backoff(attempt))
+            attempt += 1
+            if attempt > settings.OPENAI_MAX_RETRIES or time.monotonic() + delay >= deadline:
+                if isinstance(e, openai.RateLimitError):
+                    raise LLMRateLimited("OpenAI rate limit reached", retry_after=retry_after) from e
+                raise LLMUnavailable(f"OpenAI request failed: {e or type(e).__name__}") from e
+            await asyncio.sleep(delay)
+        except openai.APIStatusError:
+            # The request itself was rejected; upstream is healthy
+            breaker.record_success()
+            raise
+        except BaseException:
+            # Cancelled by the caller, or a client-side bug: no verdict on upstream
+            breaker.abandon()
+            raise
+        else:
+            breaker.record_success()
+            return result
+
+
+async def stream_chunks(stream):
+    """Iterate a streamed completion, reporting a broken stream as LLMUnavailable."""
+    try:
+        async for chunk in stream:
+            yield chunk
+    except (httpx.HTTPError, openai.APIError) as e:
+        _gateway()[2].record_failure()
+        raise LLMUnavailable(f"OpenAI stream broke off: {e}") from e
+
+
+async def stream_text(stream):
+    """Yield the text deltas of a streamed completion."""
+    async for chunk in stream_chunks(stream):
+        if chunk.choices and chunk.choices[0].delta.content is not None:
+            yield chunk.choices[0].delta.content
@@ -0,0 +1,73 @@
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+
+class PooledMailer:
+    """
+    Send many messages over a single SMTP connection.
+
+    The connection is opened lazily, recycled every ``reconnect_every``
+    messages, and dropped after a failed send so the next message starts on a
+    fresh connection. Use as a context manager so the connection is closed.
+    """
+
+    def __init__(self, reconnect_every=None):
+        self.reconnect_every = reconnect_every or settings.EMAIL_RECONNECT_EVERY
+        self.connection = None
+        self.sent = 0
+        self.failed = 0
+        self.connections_opened = 0
+        self.send_time = 0.0
+        self._since_connect = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+            self.connection = None
+
+    def _connect(self):
+        self.close()
+        self.connection = get_connection(fail_silently=False)
+        self.connection.open()
+        self.connections_opened += 1
+        self._since_connect = 0
+
+    def send(self, message):
+        """Send one message on the pooled connection, raising if it fails."""
+        if self.connection is None or self._since_connect >= self.reconnect_every:
+            self._connect()
+
+        started = time.perf_counter()
+        try:
+            self.connection.send_messages([message])
+        except Exception:
+            self.failed += 1
+            self.close()
+            raise
+        finally:
+            self.send_time += time.perf_counter() - started
+            self._since_connect += 1
+        self.sent += 1
+
+    @property
+    def messages_per_second(self):
+        return self.sent / self.send_time if self.send_time else 0.0
+
+    def stats(self):
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "connections_opened": self.connections_opened,
+            "messages_per_second": round(self.messages_per_second, 2),
+        }
@@ -1,51 +1,44 @@
-from datetime import datetime
-
-import openpyxl
-from django.apps import apps
+from django.conf import settings
 from django.core.management.base import BaseCommand
 
+from ...exports import EXPORT_CONTENT_TYPES, iter_export
 
-class Command(BaseCommand):
-    help = "Export all journalists as an Excel file with exact field names"
-
-    def handle(self, *args, **kwargs):
-        # Get the Journalist model
-        Journalist = apps.get_model(
-            "core", "Journalist"
-        )  # Replace 'your_app_name' with your actual app name
-
-        # Get field names dynamically (excluding 'id')
-        field_names = [
-            field.name for field in Journalist._meta.fields if field.name != "id"
-        ]
-
-        # Query all journalists
-        journalists = Journalist.objects.values(*field_names)
-
-        # Create a new Excel workbook and sheet
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Journalists"
 
-        # Add exact field names as headers
-        ws.append(field_names)
-
-        # Add data rows while handling timezone-aware datetime fields
-        for journalist in journalists:
-            row = []
-            for field in field_names:
-                value = journalist[field]
-
-                # If the field is a datetime, convert it to naive (remove timezone)
-                if isinstance(value, datetime) and value.tzinfo is not None:
-                    value = value.replace(tzinfo=None)
-
-                row.append(value)
-
-            ws.append(row)
-
-        # Save to file
-        file_path = "journalists.xlsx"
-        wb.save(file_path)
+class Command(BaseCommand):
+    help = "Export journalists as an Excel, CSV or JSON Lines file with exact field names"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format",
+            choices=sorted(EXPORT_CONTENT_TYPES),
+            default="xlsx",
+            help="Output format (default: xlsx)",
+        )
+        parser.add_argument(
+            "--output", help="File to write (default: journalists.<format>)"
+        )
+        parser.add_argument("--country", help="Only export journalists in this country")
+        parser.add_argument(
+            "--media-house", help="Only export journalists at this media house"
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.EXPORT_CHUNK_SIZE,
+            help="Rows fetched from the database per round trip",
+        )
+
+    def handle(self, *args, **options):
+        file_format = options["format"]
+        file_path = options["output"] or f"journalists.{file_format}"
+
+        with open(file_path, "wb") as f:
+            for chunk in iter_export(
+                file_format,
+                country=options["country"],
+                media_house=options["media_house"],
+                chunk_size=options["chunk_size"],
+            ):
+                f.write(chunk)
 
         self.stdout.write(self.style.SUCCESS(f"Exported data saved to {file_path}"))
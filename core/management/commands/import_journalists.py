@@ -1,9 +1,55 @@
 import csv
 import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
 
-from ...models import Journalist
+from ...importers import EMAIL_PATTERN, journalist_max_lengths, upsert_journalists
+
+# Media House,Name of Contact,Designation ,Contact ,Email
+CSV_COLUMNS = {
+    "email": "Email",
+    "name": "Name of Contact",
+    "phone": "Contact",
+    "title": "Designation",
+    "media_house": "Media House",
+}
+
+
+def normalize_rows(rows, country, max_lengths):
+    """
+    Turn raw CSV rows into journalist records ready for upsert.
+
+    Runs in worker processes when --workers is set. Returns the records, with
+    later rows winning on repeated emails, the number of rows skipped and the
+    number of rows read.
+    """
+    records = {}
+    skipped = 0
+    for row in rows:
+        # Strip whitespace from values
+        record = {
+            field: (row.get(column) or "").strip() or None
+            for field, column in CSV_COLUMNS.items()
+        }
+        record["country"] = country
+
+        email = record["email"]
+        too_long = any(
+            record[field] and len(record[field]) > max_length
+            for field, max_length in max_lengths.items()
+        )
+        if not email or not re.match(EMAIL_PATTERN, email) or too_long:
+            skipped += 1
+            continue
+        records.pop(email, None)
+        records[email] = record
+    return list(records.values()), skipped, len(rows)
 
 
 class Command(BaseCommand):
@@ -11,6 +57,23 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument("csv_file", type=str, help="Path to the CSV file")
+        parser.add_argument(
+            "--country",
+            default="Zambia",
+            help="Country recorded for every imported journalist (default: Zambia)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.JOURNALIST_UPSERT_BATCH_SIZE,
+            help="Rows per bulk upsert",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=0,
+            help="Processes used to validate rows (default: validate in this process)",
+        )
 
     def handle(self, *args, **options):
         csv_file_path = options["csv_file"]
@@ -19,40 +82,56 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR(f"File not found: {csv_file_path}"))
             return
 
-        with open(csv_file_path, mode="r", encoding="utf-8") as file:
+        started = time.perf_counter()
+        rows = created = updated = skipped = failed = 0
+
+        with open(csv_file_path, mode="r", encoding="utf-8", newline="") as file:
             reader = csv.DictReader(file)
 
             # Normalize column names (remove spaces)
             reader.fieldnames = [col.strip() for col in reader.fieldnames]
 
-            for row in reader:
-                # Strip whitespace from values
-                # Media House,Name of Contact,Designation ,Contact ,Email
-
-                email = row.get("Email", "").strip()
-                name = row.get("Name of Contact", "").strip()
-                phone = row.get("Contact", "").strip()
-                title = row.get("Designation", "").strip()
-                media_house = row.get("Media House", "").strip()
-
-                if not email:
+            batches = iter(lambda: list(islice(reader, options["batch_size"])), [])
+            for records, batch_skipped, batch_rows in self.normalized(
+                batches, options["workers"], options["country"]
+            ):
+                batch_created, batch_updated, failures = upsert_journalists(
+                    records, batch_size=options["batch_size"]
+                )
+                rows += batch_rows
+                created += batch_created
+                # Repeated emails within a batch count as updates, as row by row
+                updated += batch_updated + batch_rows - batch_skipped - len(records)
+                skipped += batch_skipped
+                failed += len(failures)
+                for record, reason in failures[:1]:
                     self.stdout.write(
-                        self.style.WARNING("Skipping row with missing email")
+                        self.style.WARNING(f"Batch failed at {record['email']}: {reason}")
                     )
-                    continue
-
-                journalist, created = Journalist.objects.update_or_create(
-                    email=email,
-                    defaults={
-                        "name": name or None,
-                        "phone": phone or None,
-                        "title": title or None,
-                        "media_house": media_house or None,
-                        "country": "Zambia",
-                    },
-                )
 
-                action = "Created" if created else "Updated"
-                self.stdout.write(self.style.SUCCESS(f"{action} journalist: {email}"))
+        elapsed = time.perf_counter() - started
+        rate = rows / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Import complete! {rows} rows in {elapsed:.1f}s ({rate:.0f} rows/s): "
+                f"{created} created, {updated} updated, {skipped} skipped, {failed} failed"
+            )
+        )
+
+    def normalized(self, batches, workers, country):
+        """Yield normalized batches in file order, validating up to ``workers`` at once."""
+        max_lengths = journalist_max_lengths()
+        if not workers:
+            for batch in batches:
+                yield normalize_rows(batch, country, max_lengths)
+            return
 
-        self.stdout.write(self.style.SUCCESS("Import complete!"))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for batch in batches:
+                pending.append(pool.submit(normalize_rows, batch, country, max_lengths))
+                # Bound the batches in flight so memory stays flat on huge files
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...leaderboard import rebuild_leaderboard
+from ...points import reconcile_balances
+
+
+class Command(BaseCommand):
+    help = "Rebuild journalists' stored points balances and the leaderboard from the transaction ledger"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only report mismatches; exit with an error if any are found",
+        )
+
+    def handle(self, *args, **options):
+        verify = options["verify"]
+        mismatches = reconcile_balances(fix=not verify)
+
+        for journalist, stored, expected in mismatches:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{journalist.email}: stored earned/withdrawn/balance {stored}, "
+                    f"ledger {expected}"
+                )
+            )
+
+        if verify and mismatches:
+            raise CommandError(f"{len(mismatches)} balances do not match the ledger")
+        if verify:
+            self.stdout.write(self.style.SUCCESS("All balances match the ledger"))
+            return
+
+        entries = rebuild_leaderboard()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {len(mismatches)} balances and {entries} leaderboard entries"
+            )
+        )
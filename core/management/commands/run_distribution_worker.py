@@ -0,0 +1,82 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from ...distribution import claim_deliveries, process_deliveries
+from ...mailer import PooledMailer
+from ...rendering import render_pool
+
+
+class Command(BaseCommand):
+    help = "Send queued press release distributions in chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.DISTRIBUTION_WORKERS,
+            help="Number of chunks processed in parallel",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.DISTRIBUTION_CHUNK_SIZE,
+            help="Deliveries claimed per chunk",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5,
+            help="Seconds to sleep when the queue is empty",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue and exit instead of polling",
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        chunk_size = options["chunk_size"]
+
+        self.stdout.write(
+            f"Distribution worker started ({workers} workers, chunks of {chunk_size})"
+        )
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                results = list(pool.map(self.drain, [chunk_size] * workers))
+                processed = sum(count for count, _ in results)
+                if processed:
+                    self.report(processed, [stats for _, stats in results])
+                elif options["once"]:
+                    break
+                else:
+                    time.sleep(options["poll_interval"])
+
+    def drain(self, chunk_size):
+        processed = 0
+        try:
+            with PooledMailer() as mailer:
+                while ids := claim_deliveries(chunk_size):
+                    processed += process_deliveries(ids, mailer)
+        finally:
+            close_old_connections()
+        return processed, mailer.stats()
+
+    def report(self, processed, stats):
+        sent = sum(s["sent"] for s in stats)
+        failed = sum(s["failed"] for s in stats)
+        connections = sum(s["connections_opened"] for s in stats)
+        rate = sum(s["messages_per_second"] for s in stats)
+        renders = render_pool.stats()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Processed {processed} deliveries: {sent} sent, {failed} failed "
+                f"over {connections} SMTP connections ({rate:.1f} messages/s); "
+                f"{renders['renders']} PDFs rendered, {renders['mean_seconds']}s mean, "
+                f"{renders['timeouts']} timed out"
+            )
+        )
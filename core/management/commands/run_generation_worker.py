@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from ...batches import claim_batch_items, run_batch_items
+from ...llm import close_async_client
+
+
+class Command(BaseCommand):
+    help = "Generate queued batch press releases"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.GENERATION_BATCH_CONCURRENCY,
+            help="Generations in flight at once",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5,
+            help="Seconds to sleep when the queue is empty",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue and exit instead of polling",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = options["concurrency"]
+
+        self.stdout.write(f"Generation worker started ({concurrency} concurrent generations)")
+        # One loop for the worker's lifetime, so its OpenAI connection pool is reused
+        loop = asyncio.new_event_loop()
+        try:
+            while True:
+                try:
+                    ids = claim_batch_items(concurrency)
+                    processed = loop.run_until_complete(run_batch_items(ids, concurrency)) if ids else 0
+                finally:
+                    close_old_connections()
+                if processed:
+                    self.stdout.write(self.style.SUCCESS(f"Generated {processed} batch items"))
+                elif options["once"]:
+                    break
+                else:
+                    time.sleep(options["poll_interval"])
+        finally:
+            loop.run_until_complete(close_async_client())
+            loop.close()
@@ -0,0 +1,55 @@
+# Generated by Django 5.1.1 on 2026-10-17 11:07
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_journalist_user_publishedlink_pointtransaction_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DistributionJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('subject', models.CharField(default='New Press Release', max_length=255)),
+                ('message', models.TextField(blank=True, default='')),
+                ('file_name', models.CharField(default='press_release', max_length=255)),
+                ('base_url', models.CharField(max_length=500)),
+                ('attachment_key', models.CharField(max_length=64)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed')], default='queued', max_length=20)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('press_release', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='distribution_jobs', to='core.pressrelease')),
+            ],
+            options={
+                'ordering': ['-updated_at'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='DistributionDelivery',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('email', models.EmailField(max_length=254)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='core.distributionjob')),
+            ],
+            options={
+                'ordering': ['-updated_at'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['status', 'created_at'], name='core_distri_status_f377b0_idx')],
+            },
+        ),
+    ]
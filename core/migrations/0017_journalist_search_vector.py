@@ -0,0 +1,52 @@
+# Generated by Django 5.1.1 on 2026-10-17 11:13
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+from core.search import journalist_search_vector
+
+SEARCH_INDEX = django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='journalist_search_idx')
+
+
+def add_search_index(apps, schema_editor):
+    # GIN indexes only exist on Postgres; other backends use the in-memory fallback.
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.add_index(apps.get_model('core', 'Journalist'), SEARCH_INDEX)
+
+
+def remove_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.remove_index(apps.get_model('core', 'Journalist'), SEARCH_INDEX)
+
+
+def populate_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        Journalist = apps.get_model('core', 'Journalist')
+        Journalist.objects.update(search_vector=journalist_search_vector())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_generationcache'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journalist',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name='journalist', index=SEARCH_INDEX),
+            ],
+            database_operations=[
+                migrations.RunPython(add_search_index, remove_search_index),
+            ],
+        ),
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop),
+    ]
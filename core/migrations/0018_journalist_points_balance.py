@@ -0,0 +1,46 @@
+# Generated by Django 5.1.1 on 2026-10-17 11:16
+
+from django.db import migrations, models
+from django.db.models import Q, Sum
+from django.db.models.functions import Abs
+
+
+def populate_balances(apps, schema_editor):
+    Journalist = apps.get_model('core', 'Journalist')
+    PointTransaction = apps.get_model('core', 'PointTransaction')
+    totals = PointTransaction.objects.values('journalist_id').annotate(
+        earned=Sum('points', filter=Q(transaction_type='earned'), default=0),
+        withdrawn=Sum(Abs('points'), filter=Q(transaction_type='withdrawal'), default=0),
+    ).order_by()
+    for row in totals:
+        Journalist.objects.filter(pk=row['journalist_id']).update(
+            points_earned=row['earned'],
+            points_withdrawn=row['withdrawn'],
+            points_balance=row['earned'] - row['withdrawn'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_journalist_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journalist',
+            name='points_balance',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='journalist',
+            name='points_earned',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='journalist',
+            name='points_withdrawn',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_balances, migrations.RunPython.noop),
+    ]
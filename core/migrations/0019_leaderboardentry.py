@@ -0,0 +1,52 @@
+# Generated by Django 5.1.1 on 2026-10-17 11:17
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+
+
+def populate_leaderboard(apps, schema_editor):
+    LeaderboardEntry = apps.get_model('core', 'LeaderboardEntry')
+    PointTransaction = apps.get_model('core', 'PointTransaction')
+    all_time = PointTransaction.objects.values('journalist_id').annotate(total=Sum('points')).order_by()
+    monthly = PointTransaction.objects.annotate(month=TruncMonth('created_at')).values(
+        'journalist_id', 'month'
+    ).annotate(total=Sum('points')).order_by()
+    LeaderboardEntry.objects.bulk_create(
+        [LeaderboardEntry(journalist_id=row['journalist_id'], period='all', points=row['total']) for row in all_time]
+        + [
+            LeaderboardEntry(journalist_id=row['journalist_id'], period=row['month'].strftime('%Y-%m'), points=row['total'])
+            for row in monthly
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_journalist_points_balance'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('period', models.CharField(max_length=7)),
+                ('points', models.IntegerField(default=0)),
+                ('journalist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='core.journalist')),
+            ],
+            options={
+                'ordering': ['-updated_at'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['period', '-points', 'journalist'], name='leaderboard_rank_idx')],
+                'constraints': [models.UniqueConstraint(fields=('journalist', 'period'), name='unique_leaderboard_entry')],
+            },
+        ),
+        migrations.RunPython(populate_leaderboard, migrations.RunPython.noop),
+    ]
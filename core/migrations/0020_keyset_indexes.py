@@ -0,0 +1,27 @@
+# Generated by Django 5.1.1 on 2026-10-17 11:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_leaderboardentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['-updated_at', '-id'], name='client_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='journalist',
+            index=models.Index(fields=['-updated_at', '-id'], name='journalist_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pressrelease',
+            index=models.Index(fields=['-updated_at', '-id'], name='pressrelease_keyset_idx'),
+        ),
+    ]
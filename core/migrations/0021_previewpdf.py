@@ -0,0 +1,31 @@
+# Generated by Django 5.1.1 on 2026-10-17 11:22
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PreviewPdf',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('path', models.CharField(max_length=255)),
+                ('size', models.PositiveIntegerField()),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('last_used_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'ordering': ['-updated_at'],
+                'abstract': False,
+            },
+        ),
+    ]
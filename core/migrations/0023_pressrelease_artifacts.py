@@ -0,0 +1,28 @@
+# Generated by Django 5.1.1 on 2026-10-17 11:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_generationbatch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pressrelease',
+            name='artifact_hash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='pressrelease',
+            name='rendered_html',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pressrelease',
+            name='rendered_pdf',
+            field=models.FileField(blank=True, null=True, upload_to='press_releases'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.1 on 2026-10-17 11:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_pressrelease_artifacts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generationbatchitem',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='generationbatchitem',
+            name='locked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
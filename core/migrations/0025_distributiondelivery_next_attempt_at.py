@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-17 11:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_generationbatchitem_claims'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='distributiondelivery',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
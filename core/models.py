@@ -1,8 +1,13 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
 
 from accounts.models import User
 from common.models import BaseModel
 
+from .search import refresh_search_vectors
+
 
 class Client(BaseModel):
     email = models.EmailField(unique=True)
@@ -13,6 +18,10 @@ class Client(BaseModel):
     description = models.TextField(blank=True, null=True)
     logo = models.ImageField(upload_to="clients", null=True, blank=True)
     about = models.TextField(blank=True, null=True)
+
+    class Meta(BaseModel.Meta):
+        indexes = [models.Index(fields=["-updated_at", "-id"], name="client_keyset_idx")]
+
     def __str__(self) -> str:
         return str(self.email)
 
@@ -20,15 +29,8 @@ class Client(BaseModel):
 
 class JournalistPointsManager(models.Manager):
     def get_queryset(self):
-        return super().get_queryset().annotate(
-            total_points=models.Sum(
-                models.Case(
-                    models.When(point_transactions__isnull=False, then=models.F('point_transactions__points')),
-                    default=0,
-                    output_field=models.IntegerField()
-                )
-            )
-        )
+        # Reads the stored balance rather than joining and summing the ledger
+        return super().get_queryset().annotate(total_points=models.F('points_balance'))
 
 class Journalist(BaseModel):
     user = models.OneToOneField(User, on_delete=models.CASCADE, null=True, blank=True, related_name="journalist")
@@ -38,17 +40,37 @@ class Journalist(BaseModel):
     country = models.CharField(max_length=250, blank=True, null=True)
     title = models.CharField(max_length=250, blank=True, null=True)
     media_house = models.TextField(blank=True, null=True)
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+    # Running totals of point_transactions, kept in step by PointTransaction.save
+    points_earned = models.IntegerField(default=0, editable=False)
+    points_withdrawn = models.IntegerField(default=0, editable=False)
+    points_balance = models.IntegerField(default=0, editable=False)
 
     objects = models.Manager()
     with_points = JournalistPointsManager()
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            GinIndex(fields=["search_vector"], name="journalist_search_idx"),
+            models.Index(fields=["-updated_at", "-id"], name="journalist_keyset_idx"),
+        ]
+
+    BALANCE_FIELDS = ("points_earned", "points_withdrawn", "points_balance")
+
+    def save(self, *args, **kwargs):
+        # Balances only move through PointTransaction; never write back stale ones
+        if not self._state.adding and not args and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.BALANCE_FIELDS
+            ]
+        super().save(*args, **kwargs)
+        refresh_search_vectors(Journalist.objects.filter(pk=self.pk))
     
     @property
     def current_points(self):
-        earned = self.point_transactions.filter(transaction_type='earned').aggregate(
-            total=models.Sum('points'))['total'] or 0
-        withdrawn = self.point_transactions.filter(transaction_type='withdrawal').aggregate(
-            total=models.Sum('points'))['total'] or 0
-        return earned - abs(withdrawn)
+        return self.points_balance
     
     @property
     def points_in_ksh(self):
@@ -78,6 +100,13 @@ class PressRelease(BaseModel):
     shared_with = models.ManyToManyField(
         Journalist, blank=True, related_name="shared_press_releases"
     )
+    # Final preview.html and PDF, built in the background (see core/pdf.py)
+    rendered_html = models.TextField(blank=True, null=True)
+    rendered_pdf = models.FileField(upload_to="press_releases", blank=True, null=True)
+    artifact_hash = models.CharField(max_length=64, blank=True, null=True)
+
+    class Meta(BaseModel.Meta):
+        indexes = [models.Index(fields=["-updated_at", "-id"], name="pressrelease_keyset_idx")]
 
     def __str__(self) -> str:
         return str(self.title)
@@ -129,7 +158,29 @@ class PublishedLink(BaseModel):
         return f"{self.journalist.name} - {self.press_release.title[:30]}"
 
 
+class PointTransactionQuerySet(models.QuerySet):
+    def delete(self):
+        """Delete the transactions and take each off its journalist's totals."""
+        with transaction.atomic():
+            rows = self.select_for_update().only(
+                "journalist_id", "points", "transaction_type", "created_at"
+            )
+            for point_transaction in rows:
+                point_transaction._apply_to_balance(-1)
+            return super().delete()
+
+
 class PointTransaction(BaseModel):
+    """
+    A ledger row, kept in step with the journalist's stored totals.
+
+    Creating, editing or deleting a transaction, one at a time or through a
+    queryset, adjusts ``points_earned``, ``points_withdrawn``,
+    ``points_balance`` and the leaderboard. ``QuerySet.update()`` and raw SQL
+    do not; run ``rebuild_point_balances`` after using them. Transactions are
+    only cascade-deleted with their journalist, whose totals go with them.
+    """
+
     journalist = models.ForeignKey(
         Journalist,
         on_delete=models.CASCADE,
@@ -160,6 +211,89 @@ class PointTransaction(BaseModel):
     def __str__(self):
         return f"{self.journalist.name} - {self.points} points - {self.transaction_type}"
 
+    objects = PointTransactionQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding:
+                previous = (
+                    PointTransaction.objects.select_for_update()
+                    .only("journalist_id", "points", "transaction_type", "created_at")
+                    .filter(pk=self.pk)
+                    .first()
+                )
+            super().save(*args, **kwargs)
+            if previous is not None:
+                previous._apply_to_balance(-1)
+            self._apply_to_balance(1)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            self._apply_to_balance(-1)
+            return super().delete(*args, **kwargs)
+
+    def _apply_to_balance(self, sign):
+        """Add (sign=1) or remove (sign=-1) this transaction from the journalist's totals."""
+        if self.transaction_type == 'withdrawal':
+            # Withdrawals are stored as negative points
+            points = abs(self.points) * sign
+            changes = {
+                'points_withdrawn': models.F('points_withdrawn') + points,
+                'points_balance': models.F('points_balance') - points,
+            }
+        else:
+            points = self.points * sign
+            changes = {
+                'points_earned': models.F('points_earned') + points,
+                'points_balance': models.F('points_balance') + points,
+            }
+        Journalist.objects.filter(pk=self.journalist_id).update(**changes)
+        LeaderboardEntry.add_points(self.journalist_id, self.points * sign, self.created_at)
+
+
+class LeaderboardEntry(BaseModel):
+    """Net points per journalist for all time ('all') and per month ('YYYY-MM')."""
+
+    ALL_TIME = 'all'
+
+    journalist = models.ForeignKey(
+        Journalist,
+        on_delete=models.CASCADE,
+        related_name="leaderboard_entries"
+    )
+    period = models.CharField(max_length=7)
+    points = models.IntegerField(default=0)
+
+    class Meta(BaseModel.Meta):
+        constraints = [
+            models.UniqueConstraint(fields=["journalist", "period"], name="unique_leaderboard_entry")
+        ]
+        indexes = [
+            models.Index(fields=["period", "-points", "journalist"], name="leaderboard_rank_idx")
+        ]
+
+    def __str__(self):
+        return f"{self.journalist_id} - {self.period} - {self.points} points"
+
+    @staticmethod
+    def period_for(moment):
+        return timezone.localtime(moment).strftime("%Y-%m")
+
+    @classmethod
+    def add_points(cls, journalist_id, points, moment):
+        """Add ``points`` to the all-time and monthly entries for ``moment``."""
+        for period in (cls.ALL_TIME, cls.period_for(moment)):
+            entries = cls.objects.filter(journalist_id=journalist_id, period=period)
+            if entries.update(points=models.F('points') + points):
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(journalist_id=journalist_id, period=period, points=points)
+            except IntegrityError:
+                # Another transaction created the row first
+                entries.update(points=models.F('points') + points)
+
 
 class WithdrawalRequest(BaseModel):
     journalist = models.ForeignKey(
@@ -194,3 +328,137 @@ class WithdrawalRequest(BaseModel):
 
     def __str__(self):
         return f"{self.journalist.name} - {self.points} points - {self.amount} KSH"
+
+
+class DistributionJob(BaseModel):
+    press_release = models.ForeignKey(
+        PressRelease,
+        on_delete=models.CASCADE,
+        related_name="distribution_jobs"
+    )
+    subject = models.CharField(max_length=255, default="New Press Release")
+    message = models.TextField(blank=True, default="")
+    file_name = models.CharField(max_length=255, default="press_release")
+    base_url = models.CharField(max_length=500)
+    attachment_key = models.CharField(max_length=64)
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            ('queued', 'Queued'),
+            ('running', 'Running'),
+            ('completed', 'Completed')
+        ],
+        default='queued'
+    )
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.press_release.title} - {self.status}"
+
+
+class DistributionDelivery(BaseModel):
+    job = models.ForeignKey(
+        DistributionJob,
+        on_delete=models.CASCADE,
+        related_name="deliveries"
+    )
+    email = models.EmailField()
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            ('queued', 'Queued'),
+            ('sending', 'Sending'),
+            ('sent', 'Sent'),
+            ('failed', 'Failed')
+        ],
+        default='queued'
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, null=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    # Earliest time a failed delivery may be retried
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta(BaseModel.Meta):
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        return f"{self.email} - {self.status}"
+
+
+class GenerationBatch(BaseModel):
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            ('queued', 'Queued'),
+            ('running', 'Running'),
+            ('completed', 'Completed')
+        ],
+        default='queued'
+    )
+    force_regenerate = models.BooleanField(default=False)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.pk} - {self.status}"
+
+
+class GenerationBatchItem(BaseModel):
+    batch = models.ForeignKey(
+        GenerationBatch,
+        on_delete=models.CASCADE,
+        related_name="items"
+    )
+    press_release = models.ForeignKey(
+        PressRelease,
+        on_delete=models.CASCADE,
+        related_name="batch_items"
+    )
+    prompt = models.TextField(blank=True, default="")
+    client = models.CharField(max_length=250, blank=True, default="")
+    country = models.CharField(max_length=250, blank=True, default="")
+    partners = models.JSONField(default=list, blank=True)
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            ('queued', 'Queued'),
+            ('running', 'Running'),
+            ('completed', 'Completed'),
+            ('failed', 'Failed')
+        ],
+        default='queued'
+    )
+    error = models.TextField(blank=True, null=True)
+    attempts = models.PositiveIntegerField(default=0)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.client} / {self.country} - {self.status}"
+
+
+class GenerationCache(BaseModel):
+    fingerprint = models.CharField(max_length=64, unique=True)
+    model = models.CharField(max_length=100)
+    response = models.TextField()
+    hits = models.PositiveIntegerField(default=0)
+    last_used_at = models.DateTimeField(db_index=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.model} - {self.fingerprint[:12]}"
+
+
+class PreviewPdf(BaseModel):
+    """A rendered preview PDF in storage, addressed by a hash of its inputs."""
+
+    key = models.CharField(max_length=64, unique=True)
+    path = models.CharField(max_length=255)
+    size = models.PositiveIntegerField()
+    hits = models.PositiveIntegerField(default=0)
+    last_used_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.key[:12]} - {self.size} bytes"
@@ -0,0 +1,209 @@
+import hashlib
+import logging
+import threading
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.template.loader import render_to_string
+from django.utils import timezone
+from .models import Client, PressRelease, PreviewPdf
+from .rendering import render_pdf
+
+logger = logging.getLogger(__name__)
+
+PRESS_RELEASE_PDF_DIR = "press_releases"
+PREVIEW_PDF_DIR = "previews"
+
+
+def artifact_sources(press_release):
+    """The client logo and partner images a press release's final render embeds."""
+    client = Client.objects.filter(name=press_release.client).only("logo").first()
+    client_logo = client.logo if client and client.logo else None
+    partner_images = [partner.image for partner in press_release.partners.all() if partner.image]
+    return client_logo, partner_images
+
+
+def logo_fingerprint(image):
+    """
+    Identify a stored logo by name, size and modification time.
+
+    Replacing a logo under the same name changes its fingerprint, so renders
+    that embed it are not served stale.
+    """
+    storage = image.storage
+    try:
+        return f"{image.name}:{storage.size(image.name)}:{storage.get_modified_time(image.name).timestamp()}"
+    except (NotImplementedError, OSError):
+        return image.name
+
+
+def artifact_hash(press_release, base_url, client_logo, partner_images):
+    """
+    Content address of a press release's artifacts: its body, the logos it
+    embeds and the base URL they are fetched from.
+    """
+    logos = [logo_fingerprint(client_logo) if client_logo else ""]
+    logos += [logo_fingerprint(image) for image in partner_images]
+    return preview_pdf_key(press_release.description or "", base_url, logos)
+
+
+def render_press_release_html(press_release, base_url, client_logo, partner_images):
+    return render_to_string(
+        "preview.html",
+        {
+            "data": press_release.description,
+            "client_logo": urljoin(base_url, client_logo.url) if client_logo else "",
+            "partner_logos": [image.url for image in partner_images],
+        },
+    )
+
+
+def has_current_artifacts(press_release, base_url):
+    """Whether the stored HTML and PDF were built from the release as it is now."""
+    if not press_release.artifact_hash or not press_release.rendered_pdf:
+        return False
+    sources = artifact_sources(press_release)
+    if press_release.artifact_hash != artifact_hash(press_release, base_url, *sources):
+        return False
+    return default_storage.exists(press_release.rendered_pdf.name)
+
+
+def build_artifacts(press_release_id, base_url=None):
+    """
+    Render and store the final HTML and PDF of a press release.
+
+    Artifacts are stored under their content hash, so a release is only
+    rendered again when its body or logos change, and a revision that was
+    rendered before is reused. Logos and fonts are fetched from ``base_url``,
+    the address of the request that triggered the build, or from SITE_URL
+    for builds no request triggered. Returns the press release with its
+    artifact fields up to date.
+    """
+    base_url = base_url or settings.SITE_URL
+    press_release = PressRelease.objects.get(pk=press_release_id)
+    sources = artifact_sources(press_release)
+    key = artifact_hash(press_release, base_url, *sources)
+    path = f"{PRESS_RELEASE_PDF_DIR}/{key}.pdf"
+    if press_release.artifact_hash == key and default_storage.exists(path):
+        return press_release
+
+    html_data = render_press_release_html(press_release, base_url, *sources)
+    if not default_storage.exists(path):
+        pdf = render_pdf(html_data, base_url, ["invoice"])
+        if not default_storage.exists(path):
+            default_storage.save(path, ContentFile(pdf))
+
+    # An edit made while rendering schedules its own build; don't overwrite it
+    PressRelease.objects.filter(
+        pk=press_release.pk, description=press_release.description
+    ).update(rendered_html=html_data, rendered_pdf=path, artifact_hash=key)
+    press_release.rendered_html = html_data
+    press_release.rendered_pdf = path
+    press_release.artifact_hash = key
+    return press_release
+
+
+def schedule_artifact_build(press_release, base_url=None):
+    """Build a press release's artifacts on a background thread once the current transaction commits."""
+    transaction.on_commit(lambda: start_artifact_build(press_release.pk, base_url))
+
+
+def start_artifact_build(press_release_id, base_url=None):
+    thread = threading.Thread(
+        target=_build_artifacts_thread,
+        args=(press_release_id, base_url),
+        name=f"press-release-artifacts-{press_release_id}",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def _build_artifacts_thread(press_release_id, base_url):
+    try:
+        build_artifacts(press_release_id, base_url)
+    except Exception:
+        logger.exception("Building artifacts for press release %s failed", press_release_id)
+    finally:
+        close_old_connections()
+
+
+def press_release_pdf(press_release, key, base_url):
+    """
+    Return the PDF bytes of a press release revision, building it if needed.
+
+    ``key`` is the artifact hash captured when a distribution was queued. If
+    the release has been edited since and that revision was never rendered,
+    the current revision is sent instead.
+    """
+    path = f"{PRESS_RELEASE_PDF_DIR}/{key}.pdf"
+    if not default_storage.exists(path):
+        path = build_artifacts(press_release.pk, base_url).rendered_pdf.name
+    with default_storage.open(path, "rb") as f:
+        return f.read()
+
+
+def preview_pdf_key(html_data, base_url, logos):
+    """
+    Content address of a preview: the rendered HTML plus the logos it embeds.
+
+    ``logos`` should be logo_fingerprint()s, so a replaced logo file changes the key.
+    """
+    digest = hashlib.sha256()
+    for part in [html_data, base_url, *logos]:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_preview_pdf(html_data, base_url, logos, stylesheets=()):
+    """
+    Return the storage path of the preview PDF for ``html_data``.
+
+    ``stylesheets`` name entries of rendering.PDF_STYLESHEETS.
+
+    Previews are cached under their content address, so repeat previews are
+    served from storage and concurrent previews of different releases never
+    share a file. Each new render triggers a least-recently-used sweep.
+    """
+    key = preview_pdf_key(html_data, base_url, logos)
+    now = timezone.now()
+
+    entry = PreviewPdf.objects.filter(key=key).only("path").first()
+    if entry is not None:
+        if default_storage.exists(entry.path):
+            PreviewPdf.objects.filter(pk=entry.pk).update(hits=F("hits") + 1, last_used_at=now)
+            return entry.path
+        entry.delete()
+
+    pdf = render_pdf(html_data, base_url, stylesheets)
+
+    # A concurrent render of the same preview may have saved first; storage
+    # then picks a fresh name, and the loser's copy is dropped again.
+    path = default_storage.save(f"{PREVIEW_PDF_DIR}/{key}.pdf", ContentFile(pdf))
+    entry, created = PreviewPdf.objects.get_or_create(
+        key=key, defaults={"path": path, "size": len(pdf), "last_used_at": now}
+    )
+    if not created and entry.path != path:
+        default_storage.delete(path)
+    sweep_previews()
+    return entry.path
+
+
+def sweep_previews():
+    """Delete the least recently used previews beyond the entry and byte caps."""
+    total = 0
+    stale = []
+    entries = PreviewPdf.objects.order_by("-last_used_at").values_list("pk", "path", "size")
+    for position, (pk, path, size) in enumerate(entries.iterator()):
+        total += size
+        if position >= settings.PREVIEW_CACHE_MAX_ENTRIES or total > settings.PREVIEW_CACHE_MAX_BYTES:
+            stale.append((pk, path))
+    for pk, path in stale:
+        default_storage.delete(path)
+    if stale:
+        PreviewPdf.objects.filter(pk__in=[pk for pk, _ in stale]).delete()
@@ -0,0 +1,52 @@
+from django.db.models import Q, Sum
+from django.db.models.functions import Abs
+
+from .models import Journalist, PointTransaction
+
+
+def ledger_balances():
+    """Recompute every journalist's totals from point_transactions in one query."""
+    rows = PointTransaction.objects.values("journalist_id").annotate(
+        earned=Sum("points", filter=Q(transaction_type="earned"), default=0),
+        withdrawn=Sum(Abs("points"), filter=Q(transaction_type="withdrawal"), default=0),
+    ).order_by()
+    return {row["journalist_id"]: (row["earned"], row["withdrawn"]) for row in rows}
+
+
+def reconcile_balances(fix=True, batch_size=1000):
+    """
+    Compare the stored balances with the ledger and return the mismatches.
+
+    Each mismatch is ``(journalist, stored, expected)`` where both are
+    ``(earned, withdrawn, balance)`` tuples. With ``fix`` the stored values
+    are corrected.
+    """
+    ledger = ledger_balances()
+    mismatches = []
+    journalists = Journalist.objects.only(
+        "id", "email", "points_earned", "points_withdrawn", "points_balance"
+    )
+    for journalist in journalists.iterator(chunk_size=batch_size):
+        earned, withdrawn = ledger.get(journalist.pk, (0, 0))
+        expected = (earned, withdrawn, earned - withdrawn)
+        stored = (
+            journalist.points_earned,
+            journalist.points_withdrawn,
+            journalist.points_balance,
+        )
+        if stored != expected:
+            mismatches.append((journalist, stored, expected))
+
+    if fix and mismatches:
+        for journalist, _, expected in mismatches:
+            (
+                journalist.points_earned,
+                journalist.points_withdrawn,
+                journalist.points_balance,
+            ) = expected
+        Journalist.objects.bulk_update(
+            [journalist for journalist, _, _ in mismatches],
+            ["points_earned", "points_withdrawn", "points_balance"],
+            batch_size=batch_size,
+        )
+    return mismatches
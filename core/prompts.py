@@ -0,0 +1,155 @@
+import logging
+import math
+import re
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_PIECE = re.compile(r"\w+|[^\w\s]")
+_SPACE = re.compile(r"\s+")
+
+TRUNCATION_MARKER = "[...]"
+
+
+def count_tokens(text):
+    """
+    Estimate the model tokens in ``text``.
+
+    Counts words and punctuation, with long words costing one token per four
+    characters, which tracks GPT-4o's tokenizer closely for English prose
+    without needing the tokenizer itself.
+    """
+    if not text:
+        return 0
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _PIECE.findall(text))
+
+
+def dedupe_lines(text):
+    """
+    Drop blank and repeated lines, keeping the first occurrence.
+
+    Page headers, footers and disclaimers extracted from every page of a
+    template collapse to a single copy.
+    """
+    seen = set()
+    lines = []
+    for line in (text or "").splitlines():
+        line = _SPACE.sub(" ", line).strip()
+        key = line.lower()
+        if not line or key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def fit_to_budget(text, budget):
+    """Cut ``text`` at a line boundary so it fits in ``budget`` tokens."""
+    if count_tokens(text) <= budget:
+        return text, False
+
+    budget -= count_tokens(TRUNCATION_MARKER)
+    kept = []
+    used = 0
+    for line in text.splitlines():
+        cost = count_tokens(line)
+        if used + cost > budget:
+            # A single huge line is cut by words rather than dropped whole
+            if not kept:
+                words = []
+                for word in line.split():
+                    used += count_tokens(word)
+                    if used > budget:
+                        break
+                    words.append(word)
+                kept.append(" ".join(words) or line[:budget * 4])
+            break
+        kept.append(line)
+        used += cost
+    kept.append(TRUNCATION_MARKER)
+    return "\n".join(kept), True
+
+
+class PromptBudget:
+    """Token accounting for the parts of one prompt."""
+
+    def __init__(self):
+        self.parts = {}
+        self.truncated = []
+
+    def fit(self, name, text, budget, dedupe=False):
+        """
+        Return ``text`` cut to ``budget`` tokens.
+
+        Text that fits is passed through untouched. With ``dedupe``, text
+        that does not fit first has its blank and repeated lines dropped.
+        """
+        text = text or ""
+        truncated = False
+        if count_tokens(text) > budget:
+            if dedupe:
+                text = dedupe_lines(text)
+            text, truncated = fit_to_budget(text, budget)
+        self.parts[name] = count_tokens(text)
+        if truncated:
+            self.truncated.append(name)
+        return text
+
+    def usage(self, messages):
+        return {
+            "prompt_tokens_estimate": sum(count_tokens(m["content"]) for m in messages),
+            "parts": self.parts,
+            "truncated": self.truncated,
+        }
+
+
+def build_press_release_prompt(prompt, client, partners, country, template, description, about):
+    """
+    Assemble the press release generation messages within the token budgets.
+
+    The template text gets PROMPT_TEMPLATE_TOKENS and the client description
+    and contact details PROMPT_CLIENT_TOKENS each, so the prompt size is
+    bounded whatever was uploaded. Only parts over budget are changed: a
+    template's repeated page headers and footers are dropped before it is
+    cut, while client text keeps its layout. Returns the messages and the
+    estimated token usage of each part.
+    """
+    budget = PromptBudget()
+    template = budget.fit("template", template, settings.PROMPT_TEMPLATE_TOKENS, dedupe=True)
+    description = budget.fit("client_description", description, settings.PROMPT_CLIENT_TOKENS)
+    about = budget.fit("client_about", about, settings.PROMPT_CLIENT_TOKENS)
+
+    content = f"""
+    Using this template layout and formatting {template},
+    Generate a press release for {client} in patnership with {partners} in {country}.
+    The press release must have a title, a brief description, and the main content.
+    The main press release content must be correctly formatted as HTML
+    string using appropriate tags. The content must fill atleast one page PDF. This content will be exported to PDF make sure it looks appealing.
+    Follow the standard press release format and make sure to include the following details:
+    {prompt} {description}
+    End your content with the following contact info:
+    {about}
+    """
+    messages = [
+        {
+            "role": "system",
+            "content": "You are a helpful assistant that creates DSA software engineering questions .",
+        },
+        {"role": "user", "content": content},
+    ]
+    return messages, budget.usage(messages)
+
+
+def log_generation_usage(estimate, usage=None, cached=False):
+    """Log the estimated prompt size and, when the API reports it, the billed tokens."""
+    logger.info(
+        "press release generation: estimated %s prompt tokens %s, truncated %s; "
+        "billed prompt=%s completion=%s%s",
+        estimate["prompt_tokens_estimate"],
+        estimate["parts"],
+        estimate["truncated"] or "nothing",
+        getattr(usage, "prompt_tokens", None),
+        getattr(usage, "completion_tokens", None),
+        " (cache hit)" if cached else "",
+    )
@@ -0,0 +1,187 @@
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from weasyprint import CSS, HTML
+from weasyprint.text.fonts import FontConfiguration
+
+# Stylesheets every renderer parses once at startup, by name
+PDF_STYLESHEETS = {"invoice": "css/invoice.css"}
+
+# Upper bounds, in seconds, of the render latency histogram buckets
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class RenderTimeout(Exception):
+    pass
+
+
+# Per-process renderer state, set up by _init_renderer
+_font_config = None
+_stylesheets = {}
+
+
+def _init_renderer(stylesheet_paths):
+    """Load fonts and parse the shared stylesheets once per renderer process."""
+    global _font_config, _stylesheets
+    _font_config = FontConfiguration()
+    _stylesheets = {
+        name: CSS(filename=path, font_config=_font_config)
+        for name, path in stylesheet_paths.items()
+    }
+
+
+def _render(html_data, base_url, stylesheets):
+    if _font_config is None:
+        _init_renderer(_stylesheet_paths())
+    return HTML(string=html_data, base_url=base_url).write_pdf(
+        stylesheets=[_stylesheets[name] for name in stylesheets],
+        font_config=_font_config,
+    )
+
+
+def _stylesheet_paths():
+    return {
+        name: os.path.join(settings.STATIC_ROOT, path)
+        for name, path in PDF_STYLESHEETS.items()
+    }
+
+
+class LatencyHistogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.timeouts = 0
+
+    def observe(self, seconds):
+        with self._lock:
+            self.counts[bisect_left(self.buckets, seconds)] += 1
+            self.total += seconds
+
+    def observe_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def stats(self):
+        with self._lock:
+            count = sum(self.counts)
+            labels = [f"le_{bound}" for bound in self.buckets] + ["le_inf"]
+            return {
+                "renders": count,
+                "timeouts": self.timeouts,
+                "mean_seconds": round(self.total / count, 3) if count else 0.0,
+                "histogram": dict(zip(labels, self.counts)),
+            }
+
+
+class RenderPool:
+    """
+    Render PDFs in a pool of warm WeasyPrint processes.
+
+    Each process loads fonts and parses PDF_STYLESHEETS once, so jobs only
+    pay for layout, and rendering no longer competes with request threads
+    for the GIL. A job that runs past its timeout raises RenderTimeout and
+    the pool is restarted, since a stuck renderer cannot be interrupted.
+    With ``workers=0`` jobs render in the calling thread instead.
+    """
+
+    def __init__(self, workers=None, timeout=None):
+        # Settings are read on first use, so importing this module in a
+        # renderer process does not need them
+        self._workers = workers
+        self._timeout = timeout
+        self.latency = LatencyHistogram()
+        self._lock = threading.Lock()
+        self._executor = None
+        # Pools killed to stop a timed-out render
+        self._recycled = weakref.WeakSet()
+
+    @property
+    def workers(self):
+        return settings.PDF_RENDER_WORKERS if self._workers is None else self._workers
+
+    @property
+    def timeout(self):
+        return self._timeout or settings.PDF_RENDER_TIMEOUT
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    # Forking a threaded server process is unsafe
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_renderer,
+                    initargs=(_stylesheet_paths(),),
+                )
+            return self._executor
+
+    def _restart(self, executor, recycled=False):
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            if recycled:
+                # Jobs that were running on it are retried, see render()
+                self._recycled.add(executor)
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def render(self, html_data, base_url, stylesheets=(), timeout=None):
+        """
+        Return the PDF bytes for ``html_data``, styled with the named PDF_STYLESHEETS.
+
+        A render lost because another job's timeout restarted the pool is
+        retried once on the new pool.
+        """
+        timeout = timeout or self.timeout
+        started = time.perf_counter()
+        if not self.workers:
+            pdf = _render(html_data, base_url, stylesheets)
+        else:
+            pdf = self._render_in_pool(html_data, base_url, tuple(stylesheets), timeout)
+        self.latency.observe(time.perf_counter() - started)
+        return pdf
+
+    def _render_in_pool(self, html_data, base_url, stylesheets, timeout):
+        deadline = time.monotonic() + timeout
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                future = executor.submit(_render, html_data, base_url, stylesheets)
+                return future.result(timeout=max(deadline - time.monotonic(), 0))
+            except TimeoutError:
+                self.latency.observe_timeout()
+                self._restart(executor, recycled=True)
+                raise RenderTimeout(f"PDF render exceeded {timeout}s")
+            except (BrokenProcessPool, RuntimeError):
+                # RuntimeError: submitted just as the pool was shut down
+                if attempt == 0 and executor in self._recycled:
+                    continue
+                self._restart(executor)
+                raise
+
+    def stats(self):
+        return {"workers": self.workers, **self.latency.stats()}
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+render_pool = RenderPool()
+
+
+def render_pdf(html_data, base_url, stylesheets=(), timeout=None):
+    return render_pool.render(html_data, base_url, stylesheets, timeout)
@@ -109,5 +109,8 @@ class PressReleaseWithLinksSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'description', 'client', 'country', 'is_published', 'published_links', 'created_at']
     
     def get_published_links(self, obj):
-        links = obj.published_links.all()
+        # Views pass a paginated page of links in the context
+        links = self.context.get('published_links')
+        if links is None:
+            links = obj.published_links.select_related('journalist', 'reviewed_by')
         return PublishedLinkSerializer(links, many=True).data
@@ -1,14 +1,21 @@
 from accounts.models import User
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.utils import timezone
-from django.db.models import Sum, Count, F
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ValidationError
+from django.db.models import Sum, Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.db import transaction
 
 # from accounts.permissions import IsAdmin
-from .models import Journalist, PressRelease, PublishedLink, PointTransaction, WithdrawalRequest
+from .leaderboard import WINDOWS, leaderboard_page, period_for_window
+from .models import Journalist, LeaderboardEntry, PressRelease, PublishedLink, PointTransaction, WithdrawalRequest
 from .reward_serializers import (
     PublishedLinkSerializer, 
     PointTransactionSerializer, 
@@ -18,6 +25,12 @@ from .reward_serializers import (
 )
 
 
+PUBLISHED_LINK_FIELDS = [
+    'id', 'journalist', 'press_release', 'url', 'title', 'publication_date',
+    'status', 'notes', 'reviewed_by', 'reviewed_at', 'created_at',
+]
+
+
 class JournalistDashboardAPIView(APIView):
     permission_classes = [] #permissions.IsAuthenticated
     authentication_classes = []
@@ -29,18 +42,29 @@ class JournalistDashboardAPIView(APIView):
         except:
             return Response({"error": "User is not a journalist"}, status=status.HTTP_403_FORBIDDEN)
         
-        # Get press releases shared with the journalist
-        press_releases = journalist.shared_press_releases.all()
+        # Get press releases shared with the journalist, leaving out the
+        # generated bodies the dashboard never shows
+        press_releases = journalist.shared_press_releases.select_related('author').only(
+            'id', 'title', 'description', 'client', 'country', 'is_published', 'created_at',
+            'author__first_name', 'author__last_name',
+        )
         
-        # Get published links and their status
-        published_links = journalist.published_links.all()
+        # Get published links and their status. The related manager already
+        # hands each link this journalist, so only the press release title and
+        # reviewer names need joining in.
+        published_links = journalist.published_links.select_related(
+            'press_release', 'reviewed_by'
+        ).only(
+            *PUBLISHED_LINK_FIELDS,
+            'press_release__title', 'reviewed_by__first_name', 'reviewed_by__last_name',
+        )
         
         # Get points information
         total_points = journalist.current_points
         points_in_ksh = journalist.points_in_ksh
         
         # Get withdrawal requests
-        withdrawal_requests = journalist.withdrawal_requests.all()
+        withdrawal_requests = journalist.withdrawal_requests.select_related('processed_by')
         
         serializer = JournalistDashboardSerializer({
             'journalist': journalist,
@@ -59,7 +83,7 @@ class PublishedLinkViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         # if self.request.user.is_staff:
-        return PublishedLink.objects.all()
+        return PublishedLink.objects.select_related('journalist', 'press_release', 'reviewed_by')
         # try:
         #     journalist = self.request.user.journalist
         #     return journalist.published_links.all()
@@ -73,6 +97,15 @@ class PublishedLinkViewSet(viewsets.ModelViewSet):
             serializer.save(journalist=journalist)
         except:
             raise PermissionError("User is not a journalist")
+        invalidate_admin_dashboard()
+
+    def perform_update(self, serializer):
+        serializer.save()
+        invalidate_admin_dashboard()
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        invalidate_admin_dashboard()
     
     @action(detail=True, methods=['post'],
             #  permission_classes=[permissions.IsAdminUser]
@@ -110,6 +143,7 @@ class PublishedLinkViewSet(viewsets.ModelViewSet):
                     related_press_release=link.press_release
                 )
                 point_transaction.related_links.add(link)
+            invalidate_admin_dashboard()
         
         return Response({
             "message": "Link approved and points awarded",
@@ -130,6 +164,7 @@ class PublishedLinkViewSet(viewsets.ModelViewSet):
         link.reviewed_at = timezone.now()
         link.notes = request.data.get('notes', '')
         link.save()
+        invalidate_admin_dashboard()
         
         return Response({
             "message": "Link rejected",
@@ -145,10 +180,10 @@ class WithdrawalRequestViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         if self.request.user.is_staff:
-            return WithdrawalRequest.objects.all()
+            return WithdrawalRequest.objects.select_related('journalist', 'processed_by')
         try:
             journalist = Journalist.objects.filter(email="nickson@wezaprosoft.com").first()  #self.request.user.journalist
-            return journalist.withdrawal_requests.all()
+            return journalist.withdrawal_requests.select_related('processed_by')
         except:
             return WithdrawalRequest.objects.none()
     
@@ -167,6 +202,15 @@ class WithdrawalRequestViewSet(viewsets.ModelViewSet):
             serializer.save(journalist=journalist, amount=amount)
         except Exception as e:
             raise ValueError(str(e))
+        invalidate_admin_dashboard()
+
+    def perform_update(self, serializer):
+        serializer.save()
+        invalidate_admin_dashboard()
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        invalidate_admin_dashboard()
     
     @action(detail=True, methods=['post'], 
             # permission_classes=[permissions.IsAdminUser]
@@ -203,6 +247,7 @@ class WithdrawalRequestViewSet(viewsets.ModelViewSet):
                 )
             
             withdrawal.save()
+            invalidate_admin_dashboard()
         
         return Response({
             "message": f"Withdrawal request {status_action}",
@@ -210,85 +255,176 @@ class WithdrawalRequestViewSet(viewsets.ModelViewSet):
         })
 
 
+ADMIN_DASHBOARD_CACHE_KEY = 'admin-dashboard'
+
+
+def admin_dashboard_cache_enabled():
+    """
+    Cache the dashboard only in a cache every worker shares.
+
+    A per-process cache would be invalidated in one worker only, and the
+    others would serve a stale dashboard until the TTL ran out.
+    """
+    return settings.ADMIN_DASHBOARD_CACHE_TTL > 0 and not isinstance(caches["default"], LocMemCache)
+
+
+def invalidate_admin_dashboard():
+    """Drop the cached admin dashboard once the current transaction commits."""
+    transaction.on_commit(lambda: cache.delete(ADMIN_DASHBOARD_CACHE_KEY))
+
+
 class AdminDashboardAPIView(APIView):
     permission_classes = []
     authentication_classes = []
     
     def get(self, request, format=None):
+        if not admin_dashboard_cache_enabled():
+            return Response(self.build_dashboard())
+        data = cache.get(ADMIN_DASHBOARD_CACHE_KEY)
+        if data is None:
+            data = self.build_dashboard()
+            cache.set(ADMIN_DASHBOARD_CACHE_KEY, data, settings.ADMIN_DASHBOARD_CACHE_TTL)
+        return Response(data)
+
+    def build_dashboard(self):
         # Pending links for review
         pending_links = PublishedLink.objects.filter(status='pending').count()
+
+        # Pending withdrawal requests and total KSH paid/pending, in one query
+        withdrawals = WithdrawalRequest.objects.aggregate(
+            pending=Count('id', filter=Q(status='pending')),
+            ksh_processed=Sum('amount', filter=Q(status__in=['approved', 'completed']), default=0),
+        )
+
+        # Total points awarded and withdrawn, from the stored per-journalist totals
+        points = Journalist.objects.aggregate(
+            awarded=Sum('points_earned', default=0),
+            withdrawn=Sum('points_withdrawn', default=0),
+        )
+
+        # Top journalists by points, from the precomputed leaderboard
+        top_journalists, _ = leaderboard_page(LeaderboardEntry.ALL_TIME, limit=10)
         
-        # Pending withdrawal requests
-        pending_withdrawals = WithdrawalRequest.objects.filter(status='pending').count()
-        
-        # Total points awarded
-        total_points_awarded = PointTransaction.objects.filter(
-            transaction_type='earned'
-        ).aggregate(total=Sum('points'))['total'] or 0
-        
-        # Total points withdrawn
-        total_points_withdrawn = PointTransaction.objects.filter(
-            transaction_type='withdrawal'
-        ).aggregate(total=Sum('points'))['total'] or 0
-        
-        # Total KSH paid/pending
-        total_ksh_processed = WithdrawalRequest.objects.filter(
-            status__in=['approved', 'completed']
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
-        # Top journalists by points
-        top_journalists = Journalist.with_points.all().order_by('-total_points')[:10]
-        
-        return Response({
+        return {
             'pending_links': pending_links,
-            'pending_withdrawals': pending_withdrawals,
-            'total_points_awarded': total_points_awarded,
-            'total_points_withdrawn': abs(total_points_withdrawn),
-            'total_ksh_processed': total_ksh_processed,
+            'pending_withdrawals': withdrawals['pending'],
+            'total_points_awarded': points['awarded'],
+            'total_points_withdrawn': abs(points['withdrawn']),
+            'total_ksh_processed': withdrawals['ksh_processed'],
             'top_journalists': [
                 {
-                    'name': j.name if j.name else j.email,
-                    'email': j.email,
-                    'points': j.total_points
+                    'name': j['name'],
+                    'email': j['email'],
+                    'points': j['points']
                 } for j in top_journalists
             ]
+        }
+
+
+class LeaderboardAPIView(APIView):
+    permission_classes = []
+    authentication_classes = []
+
+    def get(self, request, format=None):
+        window = request.query_params.get('window', 'all')
+        if window not in WINDOWS:
+            return Response({
+                "error": "Invalid window. Use 'all' or 'month'."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            page = max(int(request.query_params.get('page', 1)), 1)
+            page_size = min(max(int(request.query_params.get('page_size', 10)), 1), 100)
+        except ValueError:
+            return Response({
+                "error": "page and page_size must be integers"
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # month=YYYY-MM selects a past month; defaults to the current one
+        period = period_for_window(window, request.query_params.get('month'))
+        results, has_next = leaderboard_page(period, offset=(page - 1) * page_size, limit=page_size)
+
+        return Response({
+            'window': window,
+            'period': period,
+            'page': page,
+            'has_next': has_next,
+            'results': results
         })
 
 
+class PublishedLinkCursorPagination(CursorPagination):
+    ordering = '-created_at'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+def _count_subquery(queryset, expression):
+    """Correlated COUNT over ``queryset``, for counting inside a single query."""
+    return Coalesce(
+        Subquery(
+            queryset.order_by().annotate(group=Value(1)).values('group')
+            .annotate(total=expression).values('total')
+        ),
+        0,
+    )
+
+
 class PressReleaseStatsAPIView(APIView):
     permission_classes = []
     authentication_classes = []
+    pagination_class = PublishedLinkCursorPagination
     
     def get(self, request, pk=None):
+        # All counts come back with the press release in one query, each as an
+        # indexed subquery so shared journalists and links are never joined
+        links = PublishedLink.objects.filter(press_release=OuterRef('pk'))
+        shared = PressRelease.shared_with.through.objects.filter(pressrelease=OuterRef('pk'))
+        statuses = [value for value, _ in PublishedLink._meta.get_field('status').choices]
         try:
-            press_release = PressRelease.objects.get(pk=pk)
-            
-            # Get links stats
-            links_stats = press_release.published_links.values('status').annotate(
-                count=Count('id')
-            )
-            
-            # Get journalist engagement
-            journalists_shared = press_release.shared_with.count()
-            journalists_published = press_release.published_links.values(
-                'journalist'
-            ).distinct().count()
-            
-            # Calculate engagement rate
-            engagement_rate = 0
-            if journalists_shared > 0:
-                engagement_rate = (journalists_published / journalists_shared) * 100
-            
-            serializer = PressReleaseWithLinksSerializer(press_release)
-            
-            return Response({
-                'press_release': serializer.data,
-                'links_stats': links_stats,
-                'journalists_shared': journalists_shared,
-                'journalists_published': journalists_published,
-                'engagement_rate': engagement_rate
-            })
-        except PressRelease.DoesNotExist:
+            press_release = PressRelease.objects.annotate(
+                journalists_shared=_count_subquery(shared, Count('pk')),
+                journalists_published=_count_subquery(links, Count('journalist', distinct=True)),
+                **{
+                    f'links_{value}': _count_subquery(links.filter(status=value), Count('pk'))
+                    for value in statuses
+                },
+            ).get(pk=pk)
+        except (PressRelease.DoesNotExist, ValidationError):
             return Response({
                 "error": "Press release not found"
-            }, status=status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        links_stats = [
+            {'status': value, 'count': getattr(press_release, f'links_{value}')}
+            for value in statuses
+            if getattr(press_release, f'links_{value}')
+        ]
+        journalists_shared = press_release.journalists_shared
+        journalists_published = press_release.journalists_published
+
+        # Calculate engagement rate
+        engagement_rate = 0
+        if journalists_shared > 0:
+            engagement_rate = (journalists_published / journalists_shared) * 100
+
+        # Page through the links; the related manager already supplies the press release
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(
+            press_release.published_links.select_related('journalist', 'reviewed_by'),
+            request,
+            view=self,
+        )
+        serializer = PressReleaseWithLinksSerializer(
+            press_release, context={'published_links': page}
+        )
+
+        return Response({
+            'press_release': serializer.data,
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
+            'links_stats': links_stats,
+            'journalists_shared': journalists_shared,
+            'journalists_published': journalists_published,
+            'engagement_rate': engagement_rate
+        })
@@ -0,0 +1,142 @@
+import re
+import threading
+from bisect import bisect_left
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Case, Count, F, Max, Value, When
+from django.db.models.functions import Replace
+
+# Field weights, matching Postgres' default A/B/C ranking weights.
+JOURNALIST_SEARCH_WEIGHTS = {
+    "name": ("A", 1.0),
+    "email": ("A", 1.0),
+    "media_house": ("B", 0.4),
+    "title": ("C", 0.2),
+    "country": ("C", 0.2),
+}
+
+_TOKEN = re.compile(r"\w+")
+
+
+def journalist_search_vector():
+    """
+    The tsvector stored in ``Journalist.search_vector``.
+
+    Emails are split on ``@`` and ``.`` so any part of an address can be
+    searched, and the ``simple`` config keeps names from being stemmed.
+    """
+    vector = None
+    for field, (weight, _) in JOURNALIST_SEARCH_WEIGHTS.items():
+        expression = F(field)
+        if field == "email":
+            expression = Replace(
+                Replace(expression, Value("@"), Value(" ")), Value("."), Value(" ")
+            )
+        part = SearchVector(expression, weight=weight, config="simple")
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def refresh_search_vectors(queryset):
+    """Recompute the stored search vector for every journalist in ``queryset``."""
+    if connection.vendor == "postgresql":
+        queryset.update(search_vector=journalist_search_vector())
+
+
+def search_journalists(queryset, query):
+    """
+    Filter ``queryset`` to journalists matching every word of ``query``.
+
+    Each word matches as a prefix, and results are ordered by rank. Postgres
+    uses the GIN-indexed search vector; other databases fall back to an
+    in-memory index so tests behave the same.
+    """
+    terms = [term.lower() for term in _TOKEN.findall(query)]
+    if not terms:
+        return queryset.none()
+
+    if connection.vendor != "postgresql":
+        return _fallback_index.search(queryset, terms)
+
+    search_query = SearchQuery(
+        " & ".join(f"{term}:*" for term in terms), search_type="raw", config="simple"
+    )
+    return (
+        queryset.filter(search_vector=search_query)
+        .annotate(rank=SearchRank(F("search_vector"), search_query))
+        .order_by("-rank", "-updated_at")
+    )
+
+
+def _tokens(field, value):
+    if field == "email":
+        value = value.replace("@", " ").replace(".", " ")
+    return {token.lower() for token in _TOKEN.findall(value)}
+
+
+class JournalistSearchIndex:
+    """
+    Pure-Python prefix index over journalists, for databases without tsvector.
+
+    The index is rebuilt whenever the row count or latest ``updated_at``
+    changes, which costs one aggregate query per search.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._postings = {}
+        self._tokens = []
+
+    def search(self, queryset, terms):
+        model = queryset.model
+        self._ensure_current(model)
+
+        scores = None
+        for term in terms:
+            matches = {}
+            start = bisect_left(self._tokens, term)
+            for token in self._tokens[start:]:
+                if not token.startswith(term):
+                    break
+                for pk, weight in self._postings[token].items():
+                    matches[pk] = max(matches.get(pk, 0), weight)
+            if scores is None:
+                scores = matches
+            else:
+                scores = {pk: scores[pk] + weight for pk, weight in matches.items() if pk in scores}
+            if not scores:
+                return queryset.none()
+
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        return queryset.filter(pk__in=ranked).order_by(
+            Case(*[When(pk=pk, then=Value(i)) for i, pk in enumerate(ranked)]),
+            "-updated_at",
+        )
+
+    def _ensure_current(self, model):
+        version = tuple(
+            model.objects.aggregate(count=Count("pk"), latest=Max("updated_at")).values()
+        )
+        if version == self._version:
+            return
+        with self._lock:
+            if version == self._version:
+                return
+            postings = {}
+            fields = list(JOURNALIST_SEARCH_WEIGHTS)
+            for pk, *values in model.objects.values_list("pk", *fields).iterator():
+                for field, value in zip(fields, values):
+                    if not value:
+                        continue
+                    weight = JOURNALIST_SEARCH_WEIGHTS[field][1]
+                    for token in _tokens(field, value):
+                        entry = postings.setdefault(token, {})
+                        entry[pk] = entry.get(pk, 0) + weight
+            self._postings = postings
+            self._tokens = sorted(postings)
+            self._version = version
+
+
+_fallback_index = JournalistSearchIndex()
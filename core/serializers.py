@@ -9,21 +9,54 @@ class ClientSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class PressReleaseSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """Only return the fields named in ``?fields=a,b`` when the request has one."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        requested = request.query_params.get("fields") if request else None
+        if requested:
+            wanted = {name.strip() for name in requested.split(",")}
+            for name in set(self.fields) - wanted:
+                self.fields.pop(name)
+
+
+class PressReleaseSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = PressRelease
-        fields = "__all__"
+        exclude = ["rendered_html"]
+        read_only_fields = ["rendered_pdf", "artifact_hash"]
 
     def to_representation(self, instance):
         """Customize shared_with field serialization using JournalistSerializer."""
         representation = super().to_representation(instance)
-        representation["shared_with"] = JournalistSerializer(
-            instance.shared_with.all(), many=True
-        ).data
+        if "shared_with" in representation:
+            representation["shared_with"] = JournalistSerializer(
+                instance.shared_with.all(), many=True
+            ).data
         return representation
 
 
+class PressReleaseListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    Lightweight press release rows for list pages.
+
+    Leaves out the generated bodies and the shared journalists, which are
+    only counted; fetch a single press release for the full record.
+    """
+
+    shared_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = PressRelease
+        fields = [
+            "id", "created_at", "updated_at", "author", "title", "client",
+            "partner", "country", "is_published", "shared_count",
+        ]
+
+
 class JournalistSerializer(serializers.ModelSerializer):
     class Meta:
         model = Journalist
-        fields = "__all__"
+        exclude = ["search_vector"]
@@ -1 +1,250 @@
-# Create your tests here.
+import asyncio
+import json
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from . import llm
+from .distribution import claim_deliveries, enqueue_distribution, process_deliveries
+from .models import DistributionDelivery, Journalist, PressRelease, PublishedLink, WithdrawalRequest
+
+
+class JournalistDashboardQueryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.journalist = Journalist.objects.create(
+            email="nickson@wezaprosoft.com", name="Nickson"
+        )
+        self.reviewer = User.objects.create(
+            email="reviewer@example.com", first_name="Re", last_name="Viewer"
+        )
+
+    def add_history(self, count):
+        press_releases = PressRelease.objects.bulk_create(
+            PressRelease(title=f"Release {i}", description="...") for i in range(count)
+        )
+        self.journalist.shared_press_releases.add(*press_releases)
+        PublishedLink.objects.bulk_create(
+            PublishedLink(
+                journalist=self.journalist,
+                press_release=press_release,
+                url=f"https://example.com/{i}",
+                status="approved",
+                reviewed_by=self.reviewer,
+            )
+            for i, press_release in enumerate(press_releases)
+        )
+        WithdrawalRequest.objects.bulk_create(
+            WithdrawalRequest(
+                journalist=self.journalist,
+                points=5,
+                amount=100,
+                payment_method="M-Pesa",
+                processed_by=self.reviewer,
+            )
+            for _ in range(count)
+        )
+
+    def dashboard_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("journalist-dashboard"))
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.data
+
+    def test_query_count_does_not_grow_with_history(self):
+        self.add_history(3)
+        baseline, _ = self.dashboard_queries()
+
+        self.add_history(2000)
+        with self.assertNumQueries(baseline):
+            response = self.client.get(reverse("journalist-dashboard"))
+
+        self.assertEqual(len(response.data["published_links"]), 2003)
+        self.assertEqual(len(response.data["withdrawal_requests"]), 2003)
+        link = response.data["published_links"][0]
+        self.assertEqual(link["journalist_name"], "Nickson")
+        self.assertEqual(link["reviewer_name"], "Re Viewer")
+        self.assertTrue(link["press_release_title"].startswith("Release "))
+
+
+
+@override_settings(DISTRIBUTION_MAX_ATTEMPTS=2)
+class DistributionRenderFailureTests(TestCase):
+    def setUp(self):
+        self.press_release = PressRelease.objects.create(title="Launch", description="<p>hi</p>")
+        journalist = Journalist.objects.create(email="reporter@example.com")
+        self.job = enqueue_distribution(self.press_release, [journalist], "http://testserver/")
+        self.mailer = mock.Mock()
+
+    def run_worker(self):
+        with mock.patch("core.distribution.press_release_pdf", side_effect=RuntimeError("no logo")):
+            ids = claim_deliveries(10)
+            process_deliveries(ids, self.mailer)
+        return ids
+
+    def test_render_failure_requeues_then_fails_deliveries(self):
+        self.assertEqual(len(self.run_worker()), 1)
+        delivery = DistributionDelivery.objects.get(job=self.job)
+        self.assertEqual(delivery.status, "queued")
+        self.assertIn("no logo", delivery.error)
+        self.assertIsNotNone(delivery.next_attempt_at)
+
+        DistributionDelivery.objects.filter(pk=delivery.pk).update(next_attempt_at=None)
+        self.run_worker()
+        delivery.refresh_from_db()
+        self.assertEqual((delivery.status, delivery.attempts), ("failed", 2))
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, "completed")
+        self.mailer.send.assert_not_called()
+
+    def test_stale_delivery_out_of_attempts_is_failed(self):
+        DistributionDelivery.objects.filter(job=self.job).update(
+            status="sending", attempts=2, locked_at=timezone.now() - timedelta(days=1)
+        )
+        self.assertEqual(claim_deliveries(10), [])
+        self.assertEqual(DistributionDelivery.objects.get(job=self.job).status, "failed")
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, "completed")
+
+
+COMPLETION = {
+    "id": "chatcmpl-test",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o",
+    "choices": [
+        {"index": 0, "message": {"role": "assistant", "content": "hello"}, "finish_reason": "stop"}
+    ],
+}
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    """Local stand-in for the OpenAI API that plays back scripted responses."""
+
+    def __init__(self, responses):
+        super().__init__(("127.0.0.1", 0), FakeOpenAIHandler)
+        # (status, headers, delay in seconds); the last one repeats
+        self.responses = list(responses)
+        self.requests = 0
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        server = self.server
+        server.requests += 1
+        status, headers, delay = server.responses[min(server.requests, len(server.responses)) - 1]
+        time.sleep(delay)
+        body = json.dumps(COMPLETION if status == 200 else {"error": {"message": "fake"}}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except BrokenPipeError:
+            # The client gave up on a deliberately slow response
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@override_settings(
+    OPENAI_KEY="test",
+    OPENAI_BACKOFF_BASE=0.01,
+    OPENAI_MAX_RETRIES=3,
+    OPENAI_BREAKER_THRESHOLD=2,
+    OPENAI_BREAKER_COOLDOWN=60,
+)
+class LLMGatewayTests(SimpleTestCase):
+    def serve(self, *responses):
+        server = FakeOpenAIServer(responses)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        llm.reset_gateway()
+        self.addCleanup(llm.reset_gateway)
+        return server
+
+    def complete(self, server, **kwargs):
+        with self.settings(OPENAI_BASE_URL=server.base_url):
+            return async_to_sync(llm.chat_completion)(
+                model="gpt-4o", messages=[{"role": "user", "content": "hi"}], **kwargs
+            )
+
+    def test_rate_limit_is_retried_after_retry_after(self):
+        server = self.serve((429, {"retry-after-ms": "300"}, 0), (200, {}, 0))
+        started = time.monotonic()
+        response = self.complete(server)
+        self.assertEqual(response.choices[0].message.content, "hello")
+        self.assertEqual(server.requests, 2)
+        self.assertGreaterEqual(time.monotonic() - started, 0.3)
+
+    def test_persistent_rate_limit_raises_rate_limited(self):
+        server = self.serve((429, {"retry-after": "1"}, 0))
+        with self.assertRaises(llm.LLMRateLimited) as caught:
+            self.complete(server, timeout=1.5)
+        self.assertEqual(caught.exception.retry_after, 1)
+
+    def test_deadline_cuts_off_slow_upstream(self):
+        server = self.serve((200, {}, 2))
+        started = time.monotonic()
+        with self.assertRaises(llm.LLMUnavailable):
+            self.complete(server, timeout=0.5)
+        self.assertLess(time.monotonic() - started, 1.5)
+
+    def test_breaker_fails_fast_once_open(self):
+        server = self.serve((500, {}, 0))
+        with self.settings(OPENAI_MAX_RETRIES=0):
+            for _ in range(2):
+                with self.assertRaises(llm.LLMUnavailable):
+                    self.complete(server)
+            with self.assertRaises(llm.LLMUnavailable):
+                self.complete(server)
+        self.assertEqual(server.requests, 2)
+
+    def test_rate_limits_do_not_open_breaker(self):
+        server = self.serve((429, {"retry-after": "1"}, 0))
+        with self.settings(OPENAI_MAX_RETRIES=0):
+            for _ in range(3):
+                with self.assertRaises(llm.LLMRateLimited):
+                    self.complete(server)
+        self.assertEqual(server.requests, 3)
+        self.assertEqual(llm._gateway()[2].state, "closed")
+
+    def test_deadline_spent_waiting_for_limits_releases_half_open_trial(self):
+        server = self.serve((200, {}, 0))
+        _, token_bucket, breaker = llm._gateway()
+        breaker.failures = 2
+        breaker.opened_at = time.monotonic() - 61
+
+        async def acquire_until_deadline(amount=1, deadline=None):
+            await asyncio.sleep(deadline - time.monotonic() + 0.01)
+
+        with mock.patch.object(token_bucket, "acquire", acquire_until_deadline):
+            with self.assertRaises(llm.LLMUnavailable):
+                self.complete(server, timeout=0.2)
+        self.assertEqual(server.requests, 0)
+        self.assertFalse(breaker._trial_running)
+
+        response = self.complete(server)
+        self.assertEqual(response.choices[0].message.content, "hello")
+        self.assertEqual(breaker.state, "closed")
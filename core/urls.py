@@ -4,11 +4,17 @@ from . import journalists
 from .views import (
     ClientDetailView,
     ClientListView,
+    DistributionJobDetailView,
     GeneratePressReleaseAPI,
+    GeneratePressReleaseBatchAPI,
+    GeneratePressReleaseStreamAPI,
+    GenerationBatchDetailView,
     JournalistDetailView,
+    PdfRenderStatsView,
     PressDistribute,
     PressPreview,
     PressReleaseDetailView,
+    PressReleaseDownloadView,
     PressReleaseListCreateView,
     StreamOpenAIResponseView,
     index,
@@ -21,6 +27,7 @@ from .rewards import (
     WithdrawalRequestViewSet,
     JournalistDashboardAPIView,
     AdminDashboardAPIView,
+    LeaderboardAPIView,
     PressReleaseStatsAPIView
 )
 
@@ -40,6 +47,17 @@ urlpatterns = [
         PressReleaseDetailView.as_view(),
         name="press-release-detail",
     ),
+    path(
+        "press-releases/<uuid:pk>/download/",
+        PressReleaseDownloadView.as_view(),
+        name="press-release-download",
+    ),
+    path(
+        "press-releases/<uuid:pk>/download/html/",
+        PressReleaseDownloadView.as_view(),
+        {"kind": "html"},
+        name="press-release-download-html",
+    ),
     path(
         "preview-press-release/",
         PressPreview.as_view(),
@@ -50,14 +68,32 @@ urlpatterns = [
         PressDistribute.as_view(),
         name="press-release-preview",
     ),
+    path(
+        "distribution-jobs/<uuid:pk>/",
+        DistributionJobDetailView.as_view(),
+        name="distribution-job-detail",
+    ),
+    path("pdf/render-stats/", PdfRenderStatsView.as_view(), name="pdf-render-stats"),
     path("answer", stream_opena_response),
     path("ai-answer", StreamOpenAIResponseView.as_view()),
     path("generate-press-release/", GeneratePressReleaseAPI.as_view()),
+    path("generate-press-release/stream/", GeneratePressReleaseStreamAPI.as_view()),
+    path("generate-press-release/batch/", GeneratePressReleaseBatchAPI.as_view()),
+    path(
+        "generation-batches/<uuid:pk>/",
+        GenerationBatchDetailView.as_view(),
+        name="generation-batch-detail",
+    ),
     path("clients/", ClientListView.as_view(), name="clients"),
     path("clients/<uuid:pk>/", ClientDetailView.as_view(), name="client-detail"),
     path(
         "journalists/", journalists.JournalistListView.as_view(), name="journalist-list"
     ),
+    path(
+        "journalists/export/",
+        journalists.JournalistExportView.as_view(),
+        name="journalist-export",
+    ),
     path(
         "journalists/<uuid:pk>/",
         JournalistDetailView.as_view(),
@@ -73,5 +109,6 @@ urlpatterns = [
     path('', include(router.urls)),
     path('journalist/dashboard/', JournalistDashboardAPIView.as_view(), name='journalist-dashboard'),
     path('admins/dashboard/', AdminDashboardAPIView.as_view(), name='admin-dashboard'),
+    path('leaderboard/', LeaderboardAPIView.as_view(), name='leaderboard'),
     path('press-release/<str:pk>/stats/', PressReleaseStatsAPIView.as_view(), name='press-release-stats'),
 ]
@@ -1,8 +1,10 @@
-from .models import Client
-import openai
-from django.conf import settings
+from asgiref.sync import sync_to_async
 
-openai.api_key = settings.OPENAI_KEY
+from . import llm
+from .generation_cache import get_cached_generation, prompt_fingerprint, store_generation
+from .models import Client
+from .pdf import schedule_artifact_build
+from .prompts import build_press_release_prompt, log_generation_usage
 
 
 additional_data = "Write a press release about the launch of a training program for young entrepreneurs in Zambia by MTN Zambia and impact hub. The 1st paragraph of this training this training is announcing the training. The 2nd paragraph is has facts and statistics about SMEs In Zambia and the importance of supporting young enterprise development. The 3rd paragraph is about be about quote of the minister for SMEs in Zambia and is highlight the importance of SMEs. The programs that the government has carried out and also a thank MTN this particular program. the 4th paragraph indicates that the programme targets 60 young people and the training is over 3 days and is going to feature faculty consisting of various experts Including from Zambia revenue authority and other institutions The next paragraph is has a quote of MTN Zambia CEO Abbad Reda who is going to highlight the commitment of mtn Zambia to Youth development and to help them outdo themselves every day. he's going to talk about the mtn 21 days of y'ello care. The next paragraph provides more details the 21 days Y'ello care 2023 edition in Zambia and in the rest of Africa "
@@ -49,91 +51,179 @@ standard_layout = {
 }
 
 
-def get_press_release(prompt: str, client: str, partners: list, country: str, template: str):
-    db_client = Client.objects.filter(name=client).first()
-    prompt = f"""
-    Using this template layout and formatting {template},
-    Generate a press release for {client} in patnership with {partners} in {country}.
-    The press release must have a title, a brief description, and the main content.
-    The main press release content must be correctly formatted as HTML
-    string using appropriate tags. The content must fill atleast one page PDF. This content will be exported to PDF make sure it looks appealing.
-    Follow the standard press release format and make sure to include the following details:
-    {prompt} {db_client.description}
-    End your content with the following contact info:
-    {db_client.about}
-    """
+PRESS_RELEASE_MODEL = "gpt-4o-2024-08-06"
 
-    response = openai.chat.completions.create(
-        model="gpt-4o-2024-08-06",
-        messages=[
-            {
-                "role": "system",
-                "content": "You are a helpful assistant that creates DSA software engineering questions .",
-            },
-            {"role": "user", "content": prompt},
-        ],
-        response_format={
-            "type": "json_schema",
-            "json_schema": {
-                "name": "press_release",
-                "schema": {
-                    "type": "object",
-                    "properties": {
-                        "client": {
-                            "type": "string",
-                            "description": "The name of the client or organization issuing the press release.",
-                        },
-                        "partner": {
-                            "type": "string",
-                            "description": "The name of the partner organization collaborating on the press release.",
-                        },
-                        "country": {
-                            "type": "string",
-                            "description": "The country where the press release is focused or originated.",
-                        },
-                        "title": {
-                            "type": "string",
-                            "description": "The title of the press release.",
-                        },
-                        "description": {
-                            "type": "string",
-                            "description": "A brief summary of the press release.",
-                        },
-                        "content": {
-                            "type": "string",
-                            "description": "The main content of the press release formatted as an HTML string excluding <body><head> <style> <html> block tags. Format the HTML to be appealing and professional. Add a line break after each paragraph.",
-                        },
-                        "additional_data": {
-                            "type": "object",
-                            "description": "Additional relevant information to be included in the press release.",
-                            "properties": {
-                                "date": {
-                                    "type": "string",
-                                    "description": "The date of the press release.",
-                                },
-                                "contact_info": {
-                                    "type": "string",
-                                    "description": "Contact information for inquiries related to the press release.",
-                                },
-                            },
-                            "required": ["date", "contact_info"],
-                            "additionalProperties": False,
-                        },
-                    },
-                    "required": [
-                        "client",
-                        "partner",
-                        "country",
-                        "title",
-                        "description",
-                        "content",
-                        "additional_data",
-                    ],
-                    "additionalProperties": False,
+# The model emits fields in this order, so streamed clients see the title and
+# description before the long HTML content.
+PRESS_RELEASE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {
+            "type": "string",
+            "description": "The title of the press release.",
+        },
+        "description": {
+            "type": "string",
+            "description": "A brief summary of the press release.",
+        },
+        "client": {
+            "type": "string",
+            "description": "The name of the client or organization issuing the press release.",
+        },
+        "partner": {
+            "type": "string",
+            "description": "The name of the partner organization collaborating on the press release.",
+        },
+        "country": {
+            "type": "string",
+            "description": "The country where the press release is focused or originated.",
+        },
+        "content": {
+            "type": "string",
+            "description": "The main content of the press release formatted as an HTML string excluding <body><head> <style> <html> block tags. Format the HTML to be appealing and professional. Add a line break after each paragraph.",
+        },
+        "additional_data": {
+            "type": "object",
+            "description": "Additional relevant information to be included in the press release.",
+            "properties": {
+                "date": {
+                    "type": "string",
+                    "description": "The date of the press release.",
+                },
+                "contact_info": {
+                    "type": "string",
+                    "description": "Contact information for inquiries related to the press release.",
                 },
-                "strict": True,
             },
+            "required": ["date", "contact_info"],
+            "additionalProperties": False,
         },
+    },
+    "required": [
+        "title",
+        "description",
+        "client",
+        "partner",
+        "country",
+        "content",
+        "additional_data",
+    ],
+    "additionalProperties": False,
+}
+
+
+PRESS_RELEASE_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "press_release",
+        "schema": PRESS_RELEASE_SCHEMA,
+        "strict": True,
+    },
+}
+
+
+def build_press_release_messages(prompt: str, client: str, partners: list, country: str, template: str):
+    """Return the generation messages and their estimated token usage."""
+    db_client = Client.objects.filter(name=client).first()
+    return build_press_release_prompt(
+        prompt,
+        client,
+        partners,
+        country,
+        template,
+        description=db_client.description if db_client else "",
+        about=db_client.about if db_client else "",
+    )
+
+
+def save_generated_press_release(press_release, client, pr_data, base_url=None):
+    """
+    Copy a generated press release document onto ``press_release`` and save it.
+
+    ``base_url`` is the requesting site's address, used to render the artifacts.
+    """
+    press_release.client = client
+    press_release.title = pr_data["title"]
+    press_release.partner = pr_data["partner"]
+    press_release.description = pr_data["description"]
+    press_release.content = pr_data["content"]
+    press_release.country = pr_data["country"]
+    press_release.additional_data = pr_data["additional_data"]
+
+    press_release.save()
+    schedule_artifact_build(press_release, base_url)
+
+
+async def aget_press_release(prompt: str, client: str, partners: list, country: str, template: str,
+                             force_regenerate: bool = False):
+    messages, estimate = await sync_to_async(build_press_release_messages)(
+        prompt, client, partners, country, template
+    )
+
+    # Identical prompts are answered from the generation cache unless forced.
+    fingerprint = prompt_fingerprint(messages, PRESS_RELEASE_SCHEMA, PRESS_RELEASE_MODEL)
+    if not force_regenerate:
+        cached = await sync_to_async(get_cached_generation)(fingerprint)
+        if cached is not None:
+            log_generation_usage(estimate, cached=True)
+            return cached
+
+    response = await llm.chat_completion(
+        model=PRESS_RELEASE_MODEL,
+        messages=messages,
+        response_format=PRESS_RELEASE_RESPONSE_FORMAT,
     )
 
-    return response.choices[0].message.content
+    choice = response.choices[0]
+    content = choice.message.content
+    log_generation_usage(estimate, response.usage)
+    await sync_to_async(store_generation)(
+        fingerprint, PRESS_RELEASE_MODEL, content, choice.finish_reason
+    )
+    return content
+
+
+async def astream_press_release(prompt: str, client: str, partners: list, country: str, template: str,
+                                force_regenerate: bool = False):
+    """Like aget_press_release, but yield the JSON text as the model produces it."""
+    messages, estimate = await sync_to_async(build_press_release_messages)(
+        prompt, client, partners, country, template
+    )
+
+    fingerprint = prompt_fingerprint(messages, PRESS_RELEASE_SCHEMA, PRESS_RELEASE_MODEL)
+    if not force_regenerate:
+        cached = await sync_to_async(get_cached_generation)(fingerprint)
+        if cached is not None:
+            log_generation_usage(estimate, cached=True)
+            yield cached
+            return
+
+    response_stream = await llm.chat_completion(
+        model=PRESS_RELEASE_MODEL,
+        messages=messages,
+        response_format=PRESS_RELEASE_RESPONSE_FORMAT,
+        stream=True,
+        # The last chunk then carries the token usage, with no choices
+        stream_options={"include_usage": True},
+    )
+
+    content = []
+    usage = None
+    finish_reason = None
+    async for chunk in llm.stream_chunks(response_stream):
+        if chunk.usage is not None:
+            usage = chunk.usage
+        if not chunk.choices:
+            continue
+        if chunk.choices[0].finish_reason is not None:
+            finish_reason = chunk.choices[0].finish_reason
+        if chunk.choices[0].delta.content is not None:
+            content.append(chunk.choices[0].delta.content)
+            yield chunk.choices[0].delta.content
+
+    log_generation_usage(estimate, usage)
+
+    # Only reached when the stream ran to its end
+    await sync_to_async(store_generation)(
+        fingerprint, PRESS_RELEASE_MODEL, "".join(content), finish_reason
+    )
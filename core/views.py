@@ -1,61 +1,103 @@
-import io
+import asyncio
 import json
+import math
 import os
 import uuid
+from asgiref.sync import sync_to_async
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
-from django.db.models import Q
-from django.http import Http404, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from django.template.loader import render_to_string
-from openai import OpenAI
 from rest_framework import status
-from rest_framework.pagination import PageNumberPagination
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from . import utils
-from .models import Client, Journalist, Partner, PressRelease
-from .serializers import ClientSerializer, JournalistSerializer, PressReleaseSerializer
+from common.pagination import KeysetPagination
+from . import llm, utils
+from .batches import batch_progress, create_batch
+from .distribution import enqueue_distribution, job_progress, resolve_recipients
+from .extraction import extract_text_from_pdf
+from .json_stream import JsonFieldStream
+from .llm import LLMRateLimited, LLMUnavailable
+from .pdf import (
+    build_artifacts,
+    get_preview_pdf,
+    has_current_artifacts,
+    logo_fingerprint,
+    schedule_artifact_build,
+)
+from .rendering import render_pdf, render_pool
+from .models import (
+    Client,
+    DistributionJob,
+    GenerationBatch,
+    Journalist,
+    Partner,
+    PressRelease,
+)
+from .serializers import (
+    ClientSerializer,
+    JournalistSerializer,
+    PressReleaseListSerializer,
+    PressReleaseSerializer,
+)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class GeneratePressReleaseAPI(View):
+    """
+    Async view, so a worker is not pinned while the model is generating.
+
+    Database and file work runs through sync_to_async; only the OpenAI call
+    happens on the event loop.
+    """
+
+    async def post(self, request):
+        press_release, generation = await sync_to_async(self._prepare_generation)(request)
 
-API_KEY = settings.OPENAI_KEY
-client = OpenAI(api_key=API_KEY)
-
-
-import pdfplumber
-from weasyprint import HTML, CSS
-
-def extract_text_from_pdf(pdf_file):
-    """Extract raw text from an uploaded MPESA statement PDF file."""
-    text_data = []
-    
-    with pdfplumber.open(pdf_file) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if text:
-                text_data.append(text)
-
-    return "\n".join(text_data)
+        try:
+            generated_press_release = await utils.aget_press_release(**generation)
+        except LLMUnavailable as e:
+            return llm_unavailable_response(e)
+        finally:
+            if not is_asgi(request):
+                # WSGI runs each request on a new event loop; don't leave its client open
+                await llm.close_async_client()
 
+        pr_data = json.loads(generated_press_release)
+        serialized_data = await sync_to_async(self._save_generation)(
+            press_release, generation["client"], pr_data, request.build_absolute_uri("/")
+        )
+        return JsonResponse(serialized_data, status=status.HTTP_201_CREATED)
 
-class GeneratePressReleaseAPI(APIView):
-    permission_classes = []
-    authentication_classes = []
+    def _prepare_generation(self, request):
+        """
+        Create the press release and its partners for a generation request.
 
-    def post(self, request):
-        data = request.data
+        Returns the press release and the keyword arguments for the generator.
+        """
+        data = parse_request_data(request)
         prompt = data.get("prompt")
         client = data.get("client")
        
         country = data.get("country")
         object_id = data.get("id")
+        force_regenerate = str(data.get("force_regenerate", "")).lower() in ("1", "true", "yes")
+        preserve_layout = str(data.get("preserve_layout", "")).lower() in ("1", "true", "yes")
         
         uploaded_file = request.FILES.get("file")
         extracted_text = ""
         if uploaded_file and uploaded_file.name.endswith(".pdf"):
-            extracted_text = extract_text_from_pdf(uploaded_file)
+            extracted_text = extract_text_from_pdf(uploaded_file, layout=preserve_layout)
 
         
         if object_id:
@@ -68,7 +110,7 @@ class GeneratePressReleaseAPI(APIView):
         
         
         # Process partners
-        partners_data = self._extract_partners_data(request.data, request.FILES)
+        partners_data = self._extract_partners_data(data, request.FILES)
             
 
         # Create new partners
@@ -86,33 +128,18 @@ class GeneratePressReleaseAPI(APIView):
                 partner.image = saved_path
                 partner.save()
 
+        return press_release, {
+            "prompt": prompt,
+            "client": client,
+            "partners": [partner_data['name'] for partner_data in partners_data],
+            "country": country,
+            "template": extracted_text,
+            "force_regenerate": force_regenerate,
+        }
 
-        generated_press_release = utils.get_press_release(
-            prompt=prompt, client=client, partners=[partner_data['name'] for partner_data in partners_data ],
-              country=country, template=extracted_text
-        )
-
-        pr_data = json.loads(generated_press_release)
-
-        try:
-            db_pr = PressRelease.objects.get(id=object_id)
-
-        except PressRelease.DoesNotExist:
-            raise Http404("PressRelease not found")
-
-        db_pr.client = client
-        db_pr.title = pr_data["title"]
-        db_pr.partner = pr_data["partner"]
-        db_pr.description = pr_data["description"]
-        db_pr.content = pr_data["content"]
-        db_pr.country = pr_data["country"]
-        db_pr.additional_data = pr_data["additional_data"]
-
-        db_pr.save()
-
-        serialized_data = PressReleaseSerializer(db_pr).data
-        return Response(serialized_data, status=status.HTTP_201_CREATED)
-    
+    def _save_generation(self, press_release, client, pr_data, base_url):
+        utils.save_generated_press_release(press_release, client, pr_data, base_url)
+        return PressReleaseSerializer(press_release).data
 
     def _extract_partners_data(self, data, files):
         """
@@ -157,11 +184,192 @@ class GeneratePressReleaseAPI(APIView):
         return partners
 
 
+class GeneratePressReleaseStreamAPI(GeneratePressReleaseAPI):
+    """
+    Generate a press release as server-sent events.
+
+    Emits a ``delta`` event per chunk of each top-level field (title and
+    description first, then the HTML content), followed by a ``done`` event
+    carrying the saved press release, or an ``error`` event.
+    """
+
+    async def post(self, request):
+        press_release, generation = await sync_to_async(self._prepare_generation)(request)
+
+        async def event_stream():
+            parser = JsonFieldStream()
+            try:
+                async for text in utils.astream_press_release(**generation):
+                    for field, delta in parser.feed(text):
+                        yield server_sent_event("delta", {"field": field, "delta": delta})
+                pr_data = parser.document()
+            except Exception as e:
+                yield server_sent_event("error", {"error": str(e)})
+                return
+
+            serialized_data = await sync_to_async(self._save_generation)(
+                press_release, generation["client"], pr_data, request.build_absolute_uri("/")
+            )
+            yield server_sent_event("done", serialized_data)
+
+        stream = event_stream() if is_asgi(request) else iterate_on_own_loop(event_stream())
+        response = StreamingHttpResponse(stream, content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+class GeneratePressReleaseBatchAPI(APIView):
+    """
+    Queue one generation per job and return the batch id for polling.
+
+    Expects ``{"jobs": [{"client", "country", "prompt", "partners": [names]}]}``.
+    Jobs are generated by the run_generation_worker command, up to
+    GENERATION_BATCH_CONCURRENCY at a time.
+    """
+
+    permission_classes = []
+    authentication_classes = []
+
+    def post(self, request):
+        jobs = request.data.get("jobs")
+        if not isinstance(jobs, list) or not jobs:
+            return Response(
+                {"error": "jobs must be a non-empty list"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(jobs) > settings.GENERATION_BATCH_MAX_JOBS:
+            return Response(
+                {"error": f"A batch can have at most {settings.GENERATION_BATCH_MAX_JOBS} jobs"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        normalized = []
+        for index, job in enumerate(jobs):
+            if not isinstance(job, dict) or not job.get("client"):
+                return Response(
+                    {"error": f"Job {index} must have a client"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            for field in ("client", "country", "prompt"):
+                if job.get(field) is not None and not isinstance(job[field], str):
+                    return Response(
+                        {"error": f"Job {index} {field} must be a string"},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+            partners = job.get("partners") or []
+            if not isinstance(partners, list) or not all(
+                isinstance(partner, str)
+                or (isinstance(partner, dict) and isinstance(partner.get("name", ""), str))
+                for partner in partners
+            ):
+                return Response(
+                    {"error": f"Job {index} partners must be a list of names"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            normalized.append({
+                "client": job["client"],
+                "country": job.get("country") or "",
+                "prompt": job.get("prompt") or "",
+                # Partners may be names or {"name": ...} objects, as in single generation
+                "partners": [
+                    partner.get("name", "") if isinstance(partner, dict) else partner
+                    for partner in partners
+                ],
+            })
+
+        force_regenerate = str(request.data.get("force_regenerate", "")).lower() in ("1", "true", "yes")
+        batch = create_batch(normalized, force_regenerate=force_regenerate)
+        return Response(batch_progress(batch), status=status.HTTP_202_ACCEPTED)
+
+
+class GenerationBatchDetailView(APIView):
+    permission_classes = []
+    authentication_classes = []
+
+    def get(self, request, pk):
+        try:
+            batch = GenerationBatch.objects.get(pk=pk)
+        except GenerationBatch.DoesNotExist:
+            raise Http404
+        return Response(batch_progress(batch))
+
+
+def parse_request_data(request):
+    """Form fields, or the decoded body for JSON requests, for plain Django views."""
+    if request.content_type == "application/json":
+        return json.loads(request.body or "{}")
+    return request.POST
+
+
+def llm_unavailable_response(error):
+    """429 when OpenAI rate-limited us, 503 otherwise, with Retry-After when known."""
+    rate_limited = isinstance(error, LLMRateLimited)
+    response = JsonResponse(
+        {"error": str(error)},
+        status=status.HTTP_429_TOO_MANY_REQUESTS if rate_limited else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+    if error.retry_after:
+        response["Retry-After"] = str(math.ceil(error.retry_after))
+    return response
+
+
+def server_sent_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+def is_asgi(request):
+    return isinstance(getattr(request, "_request", request), ASGIRequest)
+
+
+def iterate_on_own_loop(stream):
+    """
+    Drive an async iterator from a sync generator on a private event loop.
+
+    WSGI servers buffer async streaming responses whole, so under WSGI the
+    streaming views hand their stream here instead. Everything it awaits,
+    including opening the OpenAI stream, must run on this one loop.
+    """
+    loop = asyncio.new_event_loop()
+    iterator = stream.__aiter__()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(iterator.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.run_until_complete(llm.close_async_client())
+        loop.close()
+
+
+async def answer_response(request, question):
+    """Stream a plain-text answer to ``question``."""
+    messages = [{"role": "user", "content": f"{question}"}]
+
+    if not is_asgi(request):
+        async def answer():
+            response_stream = await llm.chat_completion(model="gpt-4o", messages=messages, stream=True)
+            async for text in llm.stream_text(response_stream):
+                yield text
+
+        return StreamingHttpResponse(iterate_on_own_loop(answer()), content_type="text/plain")
+
+    # Open the stream before responding, so an unavailable upstream is a 503
+    try:
+        response_stream = await llm.chat_completion(model="gpt-4o", messages=messages, stream=True)
+    except LLMUnavailable as e:
+        return llm_unavailable_response(e)
+
+    return StreamingHttpResponse(llm.stream_text(response_stream), content_type="text/plain")
+
+
 class ClientListView(APIView):
     permission_classes = []
     authentication_classes = []
 
-    pagination_class = PageNumberPagination
+    pagination_class = KeysetPagination
 
     def get(self, request):
         queryset = Client.objects.all()
@@ -242,10 +450,26 @@ class PressReleaseListCreateView(APIView):
     permission_classes = []
     authentication_classes = []
 
-    pagination_class = PageNumberPagination
+    pagination_class = KeysetPagination
 
     def get(self, request):
-        queryset = PressRelease.objects.all()
+        # Count shared journalists per row instead of loading them, and skip
+        # the generated bodies the list never shows
+        shared = PressRelease.shared_with.through.objects.filter(
+            pressrelease=OuterRef("pk")
+        )
+        queryset = PressRelease.objects.defer(
+            "description", "content", "json_content", "additional_data", "rendered_html"
+        ).annotate(
+            shared_count=Coalesce(
+                Subquery(
+                    shared.values("pressrelease")
+                    .annotate(total=Count("pk"))
+                    .values("total")
+                ),
+                0,
+            )
+        )
 
         search_query = request.query_params.get("search", None)
         if search_query:
@@ -260,13 +484,16 @@ class PressReleaseListCreateView(APIView):
         paginated_queryset = paginator.paginate_queryset(queryset, request)
 
         # Serialize data
-        serializer = PressReleaseSerializer(paginated_queryset, many=True)
+        serializer = PressReleaseListSerializer(
+            paginated_queryset, many=True, context={"request": request}
+        )
         return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = PressReleaseSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            press_release = serializer.save()
+            schedule_artifact_build(press_release, request.build_absolute_uri("/"))
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -277,22 +504,26 @@ class PressReleaseDetailView(APIView):
 
     def get_object(self, pk):
         try:
-            return PressRelease.objects.get(pk=pk)
+            return PressRelease.objects.prefetch_related(
+                Prefetch("shared_with", queryset=Journalist.objects.defer("search_vector"))
+            ).get(pk=pk)
         except PressRelease.DoesNotExist:
             raise Http404
 
     def get(self, request, pk):
         press_release = self.get_object(pk)
-        serializer = PressReleaseSerializer(press_release)
+        serializer = PressReleaseSerializer(press_release, context={"request": request})
         return Response(serializer.data)
 
     def patch(self, request, pk):
         press_release = self.get_object(pk)
         serializer = PressReleaseSerializer(
-            press_release, data=request.data, partial=True
+            press_release, data=request.data, partial=True, context={"request": request}
         )
         if serializer.is_valid():
             serializer.save()
+            # Covers edits and publishing; unchanged content is not re-rendered
+            schedule_artifact_build(press_release, request.build_absolute_uri("/"))
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -310,30 +541,31 @@ class PressPreview(APIView):
         id = request.data["id"]
         
         pr = PressRelease.objects.get(id=id)
+        base_url = request.build_absolute_uri("/")
+
+        # Serve the artifact built at publish time while it is current
+        if has_current_artifacts(pr, base_url):
+            return Response({"url": pr.rendered_pdf.url.lstrip("/")})
 
         data = pr.description
         client = Client.objects.filter(name=pr.client).first()
         client_logo = request.build_absolute_uri(client.logo.url)
 
-        partner_logos = [partner.image.url for partner in pr.partners.all() if partner.image]  # Partner logos list
+        partners = [partner for partner in pr.partners.all() if partner.image]
+        partner_logos = [partner.image.url for partner in partners]  # Partner logos list
 
         html_data = render_to_string("preview.html", {"data": data, "client_logo": client_logo, "partner_logos": partner_logos})
-        
-        html = HTML(
-            string=html_data,
-            base_url=request.build_absolute_uri("/"),
+
+        # Served from the preview cache when the same HTML and logos were rendered before
+        path = get_preview_pdf(
+            html_data,
+            base_url=base_url,
+            logos=[logo_fingerprint(client.logo), *[logo_fingerprint(partner.image) for partner in partners]],
+            stylesheets=["invoice"],
         )
-        
-        buffer = io.BytesIO()
-        html.write_pdf(target=buffer, stylesheets=[CSS(settings.STATIC_ROOT + "/css/invoice.css")])
-        
-        pdf = buffer.getvalue()
-        
-        file_name = "preview.pdf"
-        f = open(os.path.join(settings.MEDIA_ROOT, file_name), "wb")
-        f.write(pdf)
+        schedule_artifact_build(pr, base_url)
 
-        return Response({"url": f"media/{file_name}"})
+        return Response({"url": default_storage.url(path).lstrip("/")})
 
     # def post(self, request):
     #     id = request.data["id"]
@@ -362,6 +594,43 @@ class PressPreview(APIView):
        
 
 
+# Scripts, forms and frames are blocked; images, fonts and inline styles still load
+ARTIFACT_HTML_CSP = (
+    "default-src 'none'; img-src * data:; font-src * data:; style-src 'unsafe-inline' *; sandbox"
+)
+
+
+class PressReleaseDownloadView(APIView):
+    """The stored PDF or HTML of a press release, built first if it is out of date."""
+
+    permission_classes = []
+    authentication_classes = []
+
+    def get(self, request, pk, kind="pdf"):
+        try:
+            press_release = PressRelease.objects.get(pk=pk)
+        except PressRelease.DoesNotExist:
+            raise Http404
+        base_url = request.build_absolute_uri("/")
+        if not has_current_artifacts(press_release, base_url):
+            press_release = build_artifacts(press_release.pk, base_url)
+
+        if kind == "html":
+            # The body is user-edited and model-generated HTML; never let it
+            # run as a page on this origin
+            response = HttpResponse(press_release.rendered_html, content_type="text/html")
+            response["Content-Disposition"] = f'attachment; filename="press_release_{press_release.pk}.html"'
+            response["Content-Security-Policy"] = ARTIFACT_HTML_CSP
+            response["X-Content-Type-Options"] = "nosniff"
+            return response
+        return FileResponse(
+            default_storage.open(press_release.rendered_pdf.name, "rb"),
+            as_attachment=True,
+            filename=f"press_release_{press_release.pk}.pdf",
+            content_type="application/pdf",
+        )
+
+
 class PressDistribute(APIView):
     permission_classes = []
     authentication_classes = []
@@ -369,82 +638,55 @@ class PressDistribute(APIView):
     def post(self, request):
         recipients = request.data["journalists"]
         id = request.data["id"]
-        data = PressRelease.objects.get(id=id).description
         pr = PressRelease.objects.get(id=id)
         if len(recipients) == 0:
             country = request.data["countries"]
-            recipients = [
-                journalist.email
-                for journalist in Journalist.objects.filter(country=country)
-            ]
+            journalists = list(
+                Journalist.objects.filter(country=country).only("id", "email")
+            )
+            unknown = []
+        else:
+            journalists, unknown = resolve_recipients(recipients)
 
-        for recipient in recipients:
-            try:
-                journalist = Journalist.objects.get(email=recipient)
-                pr.shared_with.add(journalist)
-                pr.save()
-                send_email(request, recipient, data)
-            except Journalist.DoesNotExist:
-                print(f"Journalist with email {recipient} not found")  #
-
-        # save_client_pdf(request)
-
-        return Response({"message": "success"})
-
-
-def send_email(request, recipient, press):
-    email_from = "pr@wezawire.net"
-    data = press
-    subject = request.data.get("subject", "New Press Release")
-    file_name = request.data.get("file_name", "press_release")
-    message = request.data.get("message", "")
-    html_string = render_to_string(
-        "pdf.html",
-        {
-            "sender_name": "Wezawire",  # request.user,
-            "recipient": recipient,  # Journalist.objects.get(email=recipient).name_of_contact.split(" ")[0],
-            "sender_role": "Admin",
-        },
-    )
+        # Delivery happens in the run_distribution_worker command.
+        job = enqueue_distribution(
+            pr,
+            journalists,
+            base_url=request.build_absolute_uri("/"),
+            subject=request.data.get("subject"),
+            message=request.data.get("message"),
+            file_name=request.data.get("file_name"),
+        )
 
-    html_data = render_to_string("preview.html", {"data": data})
-    html = HTML(string=html_data, base_url=request.build_absolute_uri("/"))
-    buffer = io.BytesIO()
-    html.write_pdf(target=buffer)
-    pdf = buffer.getvalue()
-
-    email_message = EmailMultiAlternatives(
-        from_email=email_from,
-        to=[recipient],
-        subject=subject,
-        body=message,
-    )
+        return Response(
+            {
+                "message": "success",
+                "unknown_recipients": unknown,
+                **job_progress(job),
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
 
-    filename = f"{file_name}.pdf"
 
-    f = open(os.path.join(settings.MEDIA_ROOT, filename), "wb")
-    f.write(pdf)
+class DistributionJobDetailView(APIView):
+    permission_classes = []
+    authentication_classes = []
 
-    # doc = ClientDocument.objects.create(client=request.user, title=file_name)
-    # doc.document.save(file_name, File(io.BytesIO(pdf)))
+    def get(self, request, pk):
+        try:
+            job = DistributionJob.objects.get(pk=pk)
+        except DistributionJob.DoesNotExist:
+            raise Http404
+        return Response(job_progress(job))
 
-    mimetype_pdf = "application/pdf"
-    # images = DraftImage.objects.filter(draft=press)
-
-    email_message.attach_alternative(html_string, "text/html")
-    email_message.attach(filename, pdf, mimetype_pdf)
-    # for image in images:
-    #              image_path = image.image.path
-    #              with open(image_path, 'rb') as img:
-    #                 email_message.attach(os.path.basename(image_path), img.read(), 'image/jpeg')
-    email_message.template_id = "d-c00dfda29d33494ca0df0c0cab5f1aaa "
-    email_message.dynamic_template_data = (
-        {"sender_name": "Nick", "recipient": "Nelson", "sender_role": "Admin"},
-    )
 
-    email_message.send(fail_silently=False)
+class PdfRenderStatsView(APIView):
+    """Render latency histogram for this server process's PDF render pool."""
 
-    return
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response(render_pool.stats())
 
 
 def save_client_pdf(request):
@@ -452,10 +694,7 @@ def save_client_pdf(request):
     request.data["subject"]
     file_name = request.data["file_name"]
     html_data = render_to_string("preview.html", {"data": data})
-    html = HTML(string=html_data, base_url=request.build_absolute_uri("/"))
-    buffer = io.BytesIO()
-    html.write_pdf(target=buffer)
-    pdf = buffer.getvalue()
+    pdf = render_pdf(html_data, request.build_absolute_uri("/"))
 
     filename = f"{file_name}.pdf"
 
@@ -467,42 +706,17 @@ def save_client_pdf(request):
     # return doc
 
 
-def stream_opena_response(request):
+async def stream_opena_response(request):
     question = json.loads(request.body)["question"]
-
-    def generate_stream():
-        response_stream = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": f"{question}"}],
-            stream=True,
-        )
-
-        for chunk in response_stream:
-            if chunk.choices[0].delta.content is not None:
-                yield (chunk.choices[0].delta.content)
-
-    return StreamingHttpResponse(generate_stream(), content_type="text/plain")
+    return await answer_response(request, question)
 
 
 def index(request):
     return render(request, "index.html", {})
 
 
-class StreamOpenAIResponseView(APIView):
-    permission_classes = [AllowAny]
-
-    def post(self, request, *args, **kwargs):
-        question = request.data.get("question", "")
-
-        def generate_stream():
-            response_stream = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": f"{question}"}],
-                stream=True,
-            )
-
-            for chunk in response_stream:
-                if chunk.choices[0].delta.content is not None:
-                    yield (chunk.choices[0].delta.content)
-
-        return StreamingHttpResponse(generate_stream(), content_type="text/plain")
+@method_decorator(csrf_exempt, name="dispatch")
+class StreamOpenAIResponseView(View):
+    async def post(self, request, *args, **kwargs):
+        question = parse_request_data(request).get("question", "")
+        return await answer_response(request, question)
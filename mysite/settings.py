@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "accounts",
     "common",
     "core",
@@ -90,6 +91,11 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -160,3 +166,78 @@ EMAIL_USE_TLS = True
 DATA_UPLOAD_MAX_MEMORY_SIZE = 52428800
 FILE_UPLOAD_MAX_MEMORY_SIZE = 52428800
 DEFAULT_FROM_EMAIL = "pr@wezawire.net"
+
+# Press release distribution queue (see core/distribution.py)
+DISTRIBUTION_CHUNK_SIZE = env.int("DISTRIBUTION_CHUNK_SIZE", default=50)
+DISTRIBUTION_WORKERS = env.int("DISTRIBUTION_WORKERS", default=4)
+DISTRIBUTION_MAX_ATTEMPTS = env.int("DISTRIBUTION_MAX_ATTEMPTS", default=3)
+DISTRIBUTION_LOCK_TIMEOUT = env.int("DISTRIBUTION_LOCK_TIMEOUT", default=600)
+DISTRIBUTION_RETRY_DELAY = env.int("DISTRIBUTION_RETRY_DELAY", default=60)
+DISTRIBUTION_RETRY_MAX_DELAY = env.int("DISTRIBUTION_RETRY_MAX_DELAY", default=3600)
+EMAIL_RECONNECT_EVERY = env.int("EMAIL_RECONNECT_EVERY", default=100)
+
+# LLM generation cache (see core/generation_cache.py)
+GENERATION_CACHE_TTL = env.int("GENERATION_CACHE_TTL", default=7 * 24 * 60 * 60)
+GENERATION_CACHE_MAX_ENTRIES = env.int("GENERATION_CACHE_MAX_ENTRIES", default=1000)
+
+# Shared async OpenAI connection pool (see core/llm.py)
+OPENAI_MAX_CONNECTIONS = env.int("OPENAI_MAX_CONNECTIONS", default=200)
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = env.int("OPENAI_MAX_KEEPALIVE_CONNECTIONS", default=50)
+
+# LLM gateway: deadlines, retries, account rate limits and circuit breaker (see core/llm.py)
+OPENAI_BASE_URL = env("OPENAI_BASE_URL", default="")
+OPENAI_TIMEOUT = env.float("OPENAI_TIMEOUT", default=120)
+OPENAI_CONNECT_TIMEOUT = env.float("OPENAI_CONNECT_TIMEOUT", default=5)
+OPENAI_MAX_RETRIES = env.int("OPENAI_MAX_RETRIES", default=4)
+OPENAI_BACKOFF_BASE = env.float("OPENAI_BACKOFF_BASE", default=0.5)
+OPENAI_BACKOFF_MAX = env.float("OPENAI_BACKOFF_MAX", default=20)
+OPENAI_REQUESTS_PER_MINUTE = env.int("OPENAI_REQUESTS_PER_MINUTE", default=500)
+OPENAI_TOKENS_PER_MINUTE = env.int("OPENAI_TOKENS_PER_MINUTE", default=30000)
+OPENAI_BREAKER_THRESHOLD = env.int("OPENAI_BREAKER_THRESHOLD", default=5)
+OPENAI_BREAKER_COOLDOWN = env.float("OPENAI_BREAKER_COOLDOWN", default=30)
+
+# Journalist bulk upserts (see core/importers.py)
+JOURNALIST_UPSERT_BATCH_SIZE = env.int("JOURNALIST_UPSERT_BATCH_SIZE", default=1000)
+
+# Rows fetched per query when streaming journalist exports (see core/exports.py)
+EXPORT_CHUNK_SIZE = env.int("EXPORT_CHUNK_SIZE", default=2000)
+
+# Admin dashboard payload cache, invalidated on link/withdrawal changes; only used
+# with a shared CACHE_URL such as Redis or the database cache (see core/rewards.py)
+ADMIN_DASHBOARD_CACHE_TTL = env.int("ADMIN_DASHBOARD_CACHE_TTL", default=30)
+
+# Public address press release artifacts load logos and fonts from when no request
+# triggered the build, e.g. batch generations (see core/pdf.py)
+SITE_URL = env("SITE_URL", default="http://localhost:8001/")
+
+# Preview PDF cache, evicted least recently used first (see core/pdf.py)
+PREVIEW_CACHE_MAX_ENTRIES = env.int("PREVIEW_CACHE_MAX_ENTRIES", default=2000)
+PREVIEW_CACHE_MAX_BYTES = env.int("PREVIEW_CACHE_MAX_BYTES", default=512 * 1024 * 1024)
+
+# Warm WeasyPrint renderer processes; 0 renders in the calling thread (see core/rendering.py)
+PDF_RENDER_WORKERS = env.int("PDF_RENDER_WORKERS", default=2)
+PDF_RENDER_TIMEOUT = env.int("PDF_RENDER_TIMEOUT", default=30)
+
+# Template PDF text extraction (see core/extraction.py)
+TEMPLATE_MAX_PAGES = env.int("TEMPLATE_MAX_PAGES", default=20)
+TEMPLATE_MAX_CHARS = env.int("TEMPLATE_MAX_CHARS", default=20000)
+TEMPLATE_TEXT_CACHE_TTL = env.int("TEMPLATE_TEXT_CACHE_TTL", default=7 * 24 * 60 * 60)
+
+# Prompt token budgets for press release generation (see core/prompts.py)
+PROMPT_TEMPLATE_TOKENS = env.int("PROMPT_TEMPLATE_TOKENS", default=3000)
+PROMPT_CLIENT_TOKENS = env.int("PROMPT_CLIENT_TOKENS", default=800)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "core": {"handlers": ["console"], "level": env("CORE_LOG_LEVEL", default="INFO")},
+    },
+}
+
+# Batch press release generation (see core/batches.py)
+GENERATION_BATCH_CONCURRENCY = env.int("GENERATION_BATCH_CONCURRENCY", default=10)
+GENERATION_BATCH_MAX_JOBS = env.int("GENERATION_BATCH_MAX_JOBS", default=50)
+GENERATION_MAX_ATTEMPTS = env.int("GENERATION_MAX_ATTEMPTS", default=3)
+GENERATION_LOCK_TIMEOUT = env.int("GENERATION_LOCK_TIMEOUT", default=900)